@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point for the Spellaroo web application
+For deployment with uvicorn, hypercorn or another ASGI server:
+
+    uvicorn asgi:application --host 127.0.0.1 --port 8000 --workers 2
+
+The Flask app stays synchronous. Each request runs on a bounded thread pool
+(ASGI_THREADS per worker process, default 16), so blocking SQLite writes and the
+outbound HTTPS in the Google login callback wait in a pool thread while the
+event loop keeps accepting connections and streaming responses. Compare with
+mod_wsgi/gunicorn using utils/bench_concurrency.py before switching.
+"""
+
+import os
+import sys
+
+# Add your project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from a2wsgi import WSGIMiddleware
+
+# Importing wsgi runs the same startup (init_db, warm-up, pre-rendering)
+from wsgi import application as wsgi_application
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', '16'))
+
+# ASGI application object
+application = WSGIMiddleware(wsgi_application, workers=ASGI_THREADS)
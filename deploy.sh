@@ -76,6 +76,9 @@ print_step "Installing Python dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+print_step "Fingerprinting static assets..."
+python3 utils/build_static.py
+
 print_step "Setting up database..."
 python3 -c "from web_quiz import init_db; init_db()"
 
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Shared setup for the web benchmarks in this directory.
+
+Imports web_quiz against a throwaway (or given) SQLite database with CSRF and
+rate limiting switched off, so benchmarks can drive the real app in-process
+through Flask's test client.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to import main modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+BENCH_PASSWORD = 'bench-password'
+
+
+def load_app(db=None):
+    """Import web_quiz pointed at `db` (a fresh temp file if None) and initialize it."""
+    os.environ.setdefault('SECRET_KEY', 'benchmark-only-secret')
+    import web_quiz
+
+    web_quiz.DATABASE = db or os.path.join(tempfile.mkdtemp(prefix='spellaroo_bench_'), 'quiz_sessions.db')
+    web_quiz.app.config.update(WTF_CSRF_ENABLED=False, SESSION_COOKIE_SECURE=False)
+    web_quiz.limiter.enabled = False
+    web_quiz.init_db()
+    return web_quiz
+
+
+def ensure_user(web_quiz, email, name='Bench User', password=BENCH_PASSWORD):
+    """Create a local account if it doesn't exist yet; return its id."""
+    user = web_quiz.get_user_by_email(email)
+    if user:
+        return user['id']
+    return web_quiz.create_user(name, email, password, 2015, 1)
+
+
+def login(web_quiz, email, password=BENCH_PASSWORD):
+    """Return a test client logged in as `email`."""
+    client = web_quiz.app.test_client()
+    resp = client.post('/login', data={'email': email, 'password': password})
+    if resp.status_code != 302:
+        raise RuntimeError(f"login failed for {email}: HTTP {resp.status_code}")
+    return client
+
+
+def play_quiz(client, grades=('3',), num_words=10, word_type='r'):
+    """Run one full quiz through /setup and /submit_answer (alternating right/wrong)."""
+    resp = client.post('/setup', data={'grades': list(grades), 'word_type': word_type,
+                                       'num_words': str(num_words)})
+    if resp.status_code != 302:
+        raise RuntimeError(f"setup failed: HTTP {resp.status_code}")
+    client.get('/quiz')
+    answer = None
+    for i in range(num_words):
+        data = client.post('/submit_answer', json={'answer': answer if i % 2 else 'zzz'}).get_json()
+        answer = data.get('next_word')
+    return data
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Concurrency Benchmark: WSGI vs. ASGI
+
+Serves the app on a local port under each deployment model in turn and drives
+it with N concurrent simulated students (log in, then repeatedly: set up a
+10-word quiz, answer every word, open statistics). Reports throughput, latency
+percentiles and errors per model and client count.
+
+    wsgi   gunicorn, 1 worker, gthread with --threads threads (close to a
+           mod_wsgi daemon process)
+    asgi   uvicorn, 1 worker, asgi.py's bounded thread pool of --threads
+
+Both servers load the app through bench_app (temp DB, CSRF and rate limits
+off). Needs gunicorn, uvicorn and a2wsgi installed.
+
+    python3 utils/bench_concurrency.py [--clients 8,32] [--duration 10] [--threads 16] [--db seed.db]
+
+With a seed_db.py fixture the simulated students are the seeded ones, so
+/statistics runs over their full history.
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import requests
+
+from bench_app import load_app, ensure_user, BENCH_PASSWORD
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _serve_app():
+    """Server-side setup, mirroring wsgi.py's startup."""
+    web_quiz = load_app(os.environ['BENCH_DB'])
+    web_quiz.load_word_difficulty()
+    web_quiz.warm_templates()
+    web_quiz.prerender_word_pages()
+    web_quiz.build_sitemap()
+    return web_quiz.app
+
+
+def wsgi_app():
+    """gunicorn factory: 'bench_concurrency:wsgi_app()'"""
+    return _serve_app()
+
+
+def asgi_app():
+    """uvicorn factory: --factory bench_concurrency:asgi_app"""
+    from a2wsgi import WSGIMiddleware
+    return WSGIMiddleware(_serve_app(), workers=int(os.environ.get('ASGI_THREADS', '16')))
+
+
+def server_command(model, port, threads):
+    if model == 'wsgi':
+        return [sys.executable, '-m', 'gunicorn', '--chdir', UTILS_DIR, '--bind', f'127.0.0.1:{port}',
+                '--workers', '1', '--worker-class', 'gthread', '--threads', str(threads),
+                '--log-level', 'warning', 'bench_concurrency:wsgi_app()']
+    return [sys.executable, '-m', 'uvicorn', '--app-dir', UTILS_DIR, '--host', '127.0.0.1',
+            '--port', str(port), '--workers', '1', '--log-level', 'warning',
+            '--factory', 'bench_concurrency:asgi_app']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(base, proc, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            requests.get(f'{base}/robots.txt', timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError('server did not start')
+
+
+def student(base, email, stop_at, latencies, errors, lock):
+    """One simulated student looping through quizzes until stop_at."""
+    http = requests.Session()
+    mine, failed = [], 0
+
+    def call(method, path, **kwargs):
+        nonlocal failed
+        start = time.perf_counter()
+        try:
+            resp = http.request(method, base + path, allow_redirects=False, timeout=30, **kwargs)
+            if resp.status_code >= 400:
+                failed += 1
+            return resp
+        except requests.RequestException:
+            failed += 1
+            return None
+        finally:
+            mine.append(time.perf_counter() - start)
+
+    call('POST', '/login', data={'email': email, 'password': BENCH_PASSWORD})
+    while time.time() < stop_at:
+        call('POST', '/setup', data={'grades': ['3'], 'word_type': 'r', 'num_words': '10'})
+        call('GET', '/quiz')
+        answer = None
+        for i in range(10):
+            resp = call('POST', '/submit_answer', json={'answer': answer if i % 2 else 'zzz'})
+            try:
+                answer = resp.json().get('next_word')
+            except (AttributeError, ValueError):
+                answer = None
+        call('GET', '/statistics')
+
+    with lock:
+        latencies.extend(mine)
+        errors[0] += failed
+
+
+def percentile(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(model, clients, duration, threads, db, emails):
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, BENCH_DB=db, ASGI_THREADS=str(threads))
+    proc = subprocess.Popen(server_command(model, port, threads), env=env)
+    try:
+        wait_until_up(base, proc)
+        latencies, errors, lock = [], [0], threading.Lock()
+        stop_at = time.time() + duration
+        workers = [threading.Thread(target=student, args=(base, emails[i], stop_at, latencies, errors, lock))
+                   for i in range(clients)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    latencies.sort()
+    ms = lambda s: f"{s * 1000:>8.1f}"
+    print(f"{model:<6} {clients:>7} {len(latencies) / elapsed:>8.1f} "
+          f"{ms(percentile(latencies, 50))} {ms(percentile(latencies, 95))} "
+          f"{ms(percentile(latencies, 99))} {ms(latencies[-1])} {errors[0]:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare WSGI and ASGI deployments under concurrent load.')
+    parser.add_argument('--clients', default='8,32', help='comma-separated concurrent student counts')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per run')
+    parser.add_argument('--threads', type=int, default=16, help='request threads per server process')
+    parser.add_argument('--models', default='wsgi,asgi', help='comma-separated: wsgi, asgi')
+    parser.add_argument('--db', help='SQLite database, e.g. from seed_db.py (default: fresh temp DB; '
+                                     'runs add sessions to it)')
+    args = parser.parse_args()
+    client_counts = [int(c) for c in args.clients.split(',')]
+
+    db = args.db or os.path.join(tempfile.mkdtemp(prefix='spellaroo_bench_'), 'quiz_sessions.db')
+    web_quiz = load_app(db)
+    emails = [f'student{i}@bench.invalid' for i in range(max(client_counts))]
+    for email in emails:
+        ensure_user(web_quiz, email, 'Bench Student')
+
+    print(f"{args.threads} threads per server, {args.duration:.0f}s per run, latency in ms")
+    print(f"{'model':<6} {'clients':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'errors':>7}")
+    for clients in client_counts:
+        for model in args.models.split(','):
+            run(model, clients, args.duration, args.threads, db, emails)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the pure-Python hot functions
+
+Times (with timeit, best of --repeat) compare_spellings from both
+web_quiz.py and word_quiz.py across word lengths and error rates,
+build_word_pool from both files for grade combinations x word types,
+_parse_speech_components on the CLI's real utterances, build_word_cloud and
+compute_streak on long histories, then compares each result with a baseline
+and exits non-zero if any is slower by more than --threshold.
+
+Each timing is taken in rounds interleaved with a fixed pure-Python
+calibration loop and reported as a multiple of it, so a machine that is
+slower or busier across the whole run doesn't read as a regression. The
+baseline is not checked in: record one locally with --save (on the commit
+you start from), then compare after your change.
+
+    python3 utils/bench_micro.py --save          # record the local baseline
+    python3 utils/bench_micro.py                 # compare with it
+    python3 utils/bench_micro.py -k compare      # only matching benchmarks
+    python3 utils/bench_micro.py --db big.db     # build_word_cloud on a seeded DB
+"""
+
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+import platform
+from datetime import datetime, timedelta
+
+from bench_app import load_app
+
+# word_quiz starts pygame's mixer and TTS tracing at import
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('TESTING_MODE', '1')
+os.environ.setdefault('TTS_TRACE', '0')
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_micro_baseline.json')
+
+GRADES = ['k'] + list(range(1, 13))
+GRADE_COMBOS = ([[g] for g in GRADES] +
+                [GRADES[i:i + 2] for i in range(len(GRADES) - 1)] +
+                [GRADES[0:4], GRADES[4:9], GRADES[9:], GRADES])
+
+
+def misspell(word, rate, rng):
+    """Corrupt about `rate` of the letters (substitute, drop or double), at least one if rate > 0."""
+    if not rate:
+        return word
+    out = []
+    positions = set(rng.sample(range(len(word)), max(1, round(len(word) * rate))))
+    for i, ch in enumerate(word):
+        if i not in positions:
+            out.append(ch)
+            continue
+        op = rng.choice('sdi')
+        if op == 's':
+            out.append(rng.choice('abcdefghijklmnopqrstuvwxyz'))
+        elif op == 'i':
+            out.append(ch + ch)
+    return ''.join(out)
+
+
+def spelling_cases(words, length_range, rate, rng, count=50):
+    pool = [w for w in words if length_range[0] <= len(w) <= length_range[1] and w.isalpha()]
+    picked = [rng.choice(pool) for _ in range(count)]
+    return [(w, misspell(w, rate, rng)) for w in picked]
+
+
+def build_benchmarks(web_quiz, word_quiz):
+    """name -> zero-argument callable doing one unit of work"""
+    rng = random.Random(1234)
+    words = list(web_quiz.word_dictionary)
+    benches = {}
+
+    for label, lengths in [('short', (3, 4)), ('medium', (7, 8)), ('long', (11, 20))]:
+        for rate in (0, 0.15, 0.4):
+            cases = spelling_cases(words, lengths, rate, rng)
+            for module, fn in (('web', web_quiz.compare_spellings), ('cli', word_quiz.compare_spellings)):
+                benches[f'compare_spellings[{module},{label},err={rate}]'] = \
+                    lambda fn=fn, cases=cases: [fn(c, u) for c, u in cases]
+
+    for word_type in ('s', 'o', 'f', 'r'):
+        for module, fn in (('web', web_quiz.build_word_pool), ('cli', word_quiz.build_word_pool)):
+            def run(fn=fn, word_type=word_type):
+                random.seed(7)
+                return [fn(grades, word_type) for grades in GRADE_COMBOS]
+            benches[f'build_word_pool[{module},{word_type}]'] = run
+    for difficulty in ('easy', 'hard', 'mixed'):
+        benches[f'build_word_pool[web,r,{difficulty}]'] = \
+            lambda d=difficulty: [web_quiz.build_word_pool(grades, 'r', d) for grades in GRADE_COMBOS]
+
+    sample_words = rng.sample([w for w in words if w.isalpha()], 20)
+    utterances = (['Welcome to the Spelling Quiz Game!', 'spell', ' is spelled: ',
+                   'Your score: 7 out of 10', 'Keep practicing to improve your spelling!'] +
+                  sample_words + [word_quiz.spellitout(w) for w in sample_words] +
+                  [', '.join(w) for w in sample_words])
+    benches['_parse_speech_components[quiz utterances]'] = \
+        lambda: [word_quiz._parse_speech_components(u) for u in utterances]
+
+    benches['build_word_cloud[100]'] = lambda: (random.seed(3), web_quiz.build_word_cloud(100))
+
+    today = datetime.now().date()
+    histories = {
+        'daily 1y': [today - timedelta(days=i) for i in range(365)],
+        'daily 5y': [today - timedelta(days=i) for i in range(365 * 5)],
+        '3/day 1y, broken': [today - timedelta(days=i) for i in range(365) if i != 200] * 3,
+        'stale 5y': [today - timedelta(days=i + 2) for i in range(365 * 5)],
+    }
+    for label, dates in histories.items():
+        benches[f'compute_streak[{label}]'] = lambda dates=dates: web_quiz.compute_streak(dates)
+    return benches
+
+
+def calibration_loop():
+    """Fixed interpreter work (string, dict and arithmetic ops) to normalize timings against."""
+    seen = {}
+    total = 0
+    for i in range(2000):
+        key = str(i)
+        seen[key] = len(key)
+        total += seen[key] * i
+    return total
+
+
+def _loops_for(timer, seconds):
+    number = 1
+    while timer.timeit(number) < seconds:
+        number *= 2
+    return number
+
+
+def measure(fn, repeat, min_time):
+    """(best seconds per call, best calibration seconds per call), from interleaved rounds."""
+    timer, calibration = timeit.Timer(fn), timeit.Timer(calibration_loop)
+    per_round = min_time / repeat
+    number, calibration_number = _loops_for(timer, per_round), _loops_for(calibration, per_round / 4)
+    best = best_calibration = float('inf')
+    for _ in range(repeat):
+        best_calibration = min(best_calibration, calibration.timeit(calibration_number) / calibration_number)
+        best = min(best, timer.timeit(number) / number)
+    return best, best_calibration
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks with a regression check.')
+    parser.add_argument('-k', dest='filter', help='only benchmarks whose name contains this')
+    parser.add_argument('--save', action='store_true', help='write results as the new baseline')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=0.6,
+                        help='fail if slower than baseline by more than this fraction '
+                             '(unchanged code varies by up to ~45%% between runs on a 1-CPU box)')
+    parser.add_argument('--repeat', type=int, default=15, help='interleaved timing rounds (best is kept)')
+    parser.add_argument('--min-time', type=float, default=1.5, help='seconds of timing per benchmark')
+    parser.add_argument('--db', help='SQLite database for build_word_cloud (default: empty temp DB)')
+    args = parser.parse_args()
+
+    web_quiz = load_app(args.db)
+    import word_quiz
+
+    benches = build_benchmarks(web_quiz, word_quiz)
+    if args.filter:
+        benches = {name: fn for name, fn in benches.items() if args.filter in name}
+
+    baseline = {}
+    if not args.save:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"No baseline at {args.baseline}; record one first with --save")
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('results', {})
+
+    # 'relative' is seconds per call / seconds per calibration loop
+    results, regressions = {}, []
+    print(f"{'benchmark':<52} {'us/call':>10} {'relative':>10} {'baseline':>10} {'change':>8}")
+    for name, fn in benches.items():
+        seconds, calibration = measure(fn, args.repeat, args.min_time)
+        relative = seconds / calibration
+        results[name] = relative
+        base = baseline.get(name)
+        if base:
+            change = relative / base - 1
+            flag = '  REGRESSION' if change > args.threshold else ''
+            if flag:
+                regressions.append(name)
+            print(f"{name:<52} {seconds * 1e6:>10.1f} {relative:>10.2f} {base:>10.2f} {change:>+8.0%}{flag}")
+        else:
+            print(f"{name:<52} {seconds * 1e6:>10.1f} {relative:>10.2f} {'-':>10} {'':>8}")
+
+    if args.save:
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved = json.load(f).get('results', {})
+        saved.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'saved_at': datetime.now().isoformat(timespec='seconds'),
+                       'unit': 'seconds per call / seconds per calibration_loop()',
+                       'results': saved}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nSaved {len(results)} results to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Storage Benchmark
+
+Measures what the limiter costs per rate-limited request:
+
+1. Storage: microseconds per hit for the in-memory and SQLite backends
+   (fixed window, the strategy web_quiz.py uses), hitting one key and
+   hitting a fresh key per client IP.
+2. Multi-worker: several processes hit one key against each backend; the
+   SQLite counter must equal the total number of hits, the in-memory one
+   only sees its own process.
+3. In-app: a POST /register (rejected before any password hashing) with the
+   limiter off vs. on with SQLite storage.
+
+    python3 utils/bench_rate_limiter.py [--hits 5000] [--workers 4]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from bench_app import load_app
+
+LIMIT = parse('1000000 per hour')
+
+
+def time_hits(storage, hits, distinct_keys):
+    limiter = FixedWindowRateLimiter(storage)
+    start = time.perf_counter()
+    for i in range(hits):
+        limiter.hit(LIMIT, f'10.0.{i // 256 % 256}.{i % 256}' if distinct_keys else 'one-ip')
+    return (time.perf_counter() - start) / hits * 1e6
+
+
+def _worker(uri, hits, results):
+    storage = storage_from_string(uri)
+    limiter = FixedWindowRateLimiter(storage)
+    for _ in range(hits):
+        limiter.hit(LIMIT, 'shared-ip')
+    results.put(storage.get(LIMIT.key_for('shared-ip')))
+
+
+def shared_count(uri, workers, hits):
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_worker, args=(uri, hits, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    return max(results.get() for _ in procs)
+
+
+def time_requests(client, count, offset):
+    start = time.perf_counter()
+    for i in range(count):
+        client.post('/register', data={'name': 'x', 'email': f'b{i}@bench.invalid', 'password': 'x'},
+                    environ_base={'REMOTE_ADDR': f'10.1.{(offset + i) // 256 % 256}.{(offset + i) % 256}'})
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure rate limiter storage overhead.')
+    parser.add_argument('--hits', type=int, default=5000, help='hits per storage measurement')
+    parser.add_argument('--workers', type=int, default=4, help='processes for the shared-counter check')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='spellaroo_bench_')
+    backends = [('memory', 'memory://'), ('sqlite', 'sqlite://' + os.path.join(tmp, 'rate_limits.db'))]
+
+    # web_quiz registers the sqlite:// scheme with limits when imported
+    os.environ['RATELIMIT_STORAGE_URI'] = backends[1][1]
+    web_quiz = load_app()
+
+    print(f"Per hit, {args.hits} hits (microseconds)")
+    print(f"  {'backend':<8} {'one key':>10} {'key per IP':>12}")
+    for name, uri in backends:
+        storage = storage_from_string(uri)
+        print(f"  {name:<8} {time_hits(storage, args.hits, False):>10.1f} "
+              f"{time_hits(storage, args.hits, True):>12.1f}")
+
+    per_worker = max(1, args.hits // 10)
+    print(f"\nShared counter: {args.workers} processes x {per_worker} hits on one key")
+    for name, uri in backends:
+        print(f"  {name:<8} counted {shared_count(uri, args.workers, per_worker)} "
+              f"of {args.workers * per_worker}")
+
+    requests_n = max(1, args.hits // 10)
+    client = web_quiz.app.test_client()
+    web_quiz.limiter.enabled = False
+    time_requests(client, requests_n, 0)  # warm up
+    # Alternate off/on rounds and keep the best of each to damp machine noise
+    off, on = [], []
+    for r in range(5):
+        web_quiz.limiter.enabled = False
+        off.append(time_requests(client, requests_n, 0))
+        web_quiz.limiter.enabled = True
+        on.append(time_requests(client, requests_n, (r + 1) * requests_n))
+    off, on = min(off), min(on)
+    print(f"\nPOST /register, best of 5 x {requests_n} requests from distinct IPs (microseconds)")
+    print(f"  limiter off {off:>10.1f}")
+    print(f"  sqlite      {on:>10.1f}   (+{on - off:.1f} per limited request)")
+
+
+if __name__ == "__main__":
+    main()
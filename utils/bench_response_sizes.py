@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Response Size Benchmark
+
+Fetches the main pages and JSON endpoints in-process and reports bytes on the
+wire per route for identity, gzip and (if installed) brotli, with and without
+HTML minification. Use it to check what the compression layer in web_quiz.py
+saves before/after template changes.
+
+    python3 utils/bench_response_sizes.py [--db quiz_sessions.db]
+"""
+
+import argparse
+
+from bench_app import load_app, ensure_user, login, play_quiz
+
+ROUTES = ['/', '/words', '/words/grade-3-spelling-words', '/setup', '/quiz', '/statistics',
+          '/profile', '/admin/users', '/api/stats', '/api/available_words?grades=3&word_type=r']
+
+
+def measure(client, path, encoding):
+    resp = client.get(path, headers={'Accept-Encoding': encoding})
+    return resp.status_code, len(resp.get_data()), resp.headers.get('Content-Encoding', 'identity')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure response bytes per route.')
+    parser.add_argument('--db', help='SQLite database to run against (default: fresh temp DB)')
+    args = parser.parse_args()
+
+    web_quiz = load_app(args.db)
+    email = next(iter(web_quiz.ADMIN_EMAILS))
+    ensure_user(web_quiz, email, 'Bench Admin')
+    client = login(web_quiz, email)
+    play_quiz(client)
+    # Leave a quiz in progress so /quiz renders a word
+    client.post('/setup', data={'grades': ['3'], 'word_type': 'r', 'num_words': '10'})
+
+    encodings = ['identity', 'gzip'] + (['br'] if web_quiz.brotli is not None else [])
+    print(f"{'route':<45} {'raw':>8} {'minified':>9} " + ' '.join(f"{e:>8}" for e in encodings[1:]))
+    print('-' * (65 + 9 * (len(encodings) - 1)))
+    totals = [0] * (len(encodings) + 1)
+    for path in ROUTES:
+        web_quiz.app.config['MINIFY_HTML'] = False
+        status, raw, _ = measure(client, path, 'identity')
+        web_quiz.app.config['MINIFY_HTML'] = True
+        sizes = [raw] + [measure(client, path, e)[1] for e in encodings]
+        totals = [t + s for t, s in zip(totals, sizes)]
+        print(f"{path[:40] + f' [{status}]':<45} {sizes[0]:>8} {sizes[1]:>9} "
+              + ' '.join(f"{s:>8}" for s in sizes[2:]))
+    print('-' * (65 + 9 * (len(encodings) - 1)))
+    print(f"{'total':<45} {totals[0]:>8} {totals[1]:>9} " + ' '.join(f"{s:>8}" for s in totals[2:]))
+
+
+if __name__ == "__main__":
+    main()
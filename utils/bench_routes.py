@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Route Latency Benchmark
+
+Times the database-heavy pages in-process against a given database: the home
+page word cloud, /statistics, /profile and /api/stats for the busiest student
+and a typical one, and the admin user list (first page and a search). Shows the
+first request (empty per-user stats cache) and the median of --runs repeats.
+
+Use with a fixture from seed_db.py to see how the pages scale with data:
+
+    python3 utils/seed_db.py --sessions 100k --db /tmp/seed_100k.db
+    python3 utils/bench_routes.py --db /tmp/seed_100k.db [--runs 20]
+"""
+
+import time
+import argparse
+import statistics
+
+from bench_app import load_app, ensure_user, login
+
+STUDENT_ROUTES = ['/', '/statistics', '/profile', '/api/stats']
+ADMIN_ROUTES = ['/admin/users', '/admin/users?q=student1', '/admin/users?page=40']
+
+
+def time_route(client, path, runs):
+    timings = []
+    for _ in range(runs + 1):
+        start = time.perf_counter()
+        resp = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return resp.status_code, timings[0], statistics.median(timings[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the database-heavy routes.')
+    parser.add_argument('--db', required=True, help='SQLite database, e.g. from seed_db.py')
+    parser.add_argument('--runs', type=int, default=10, help='repeats per route after the first')
+    args = parser.parse_args()
+
+    web_quiz = load_app(args.db)
+    with web_quiz.connect_db() as conn:
+        sessions = conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+        per_user = conn.execute('''SELECT u.email, COUNT(s.id) AS n FROM users u
+                                   JOIN sessions s ON s.user_id = u.id
+                                   WHERE u.email LIKE '%@bench.invalid'
+                                   GROUP BY u.id ORDER BY n DESC''').fetchall()
+    if not per_user:
+        raise SystemExit(f"{args.db} has no seeded students; create it with utils/seed_db.py")
+    busiest, typical = per_user[0], per_user[len(per_user) // 2]
+
+    admin_email = next(iter(sorted(web_quiz.ADMIN_EMAILS)))
+    ensure_user(web_quiz, admin_email, 'Site Admin')
+    clients = [(f'{busiest[0]} ({busiest[1]} quizzes)', login(web_quiz, busiest[0]), STUDENT_ROUTES),
+               (f'{typical[0]} ({typical[1]} quizzes)', login(web_quiz, typical[0]), STUDENT_ROUTES),
+               (admin_email, login(web_quiz, admin_email), ADMIN_ROUTES)]
+
+    print(f"{args.db}: {sessions:,} sessions, {len(per_user):,} active students (ms)")
+    print(f"  {'route':<28} {'status':>6} {'first':>9} {'median':>9}")
+    for label, client, routes in clients:
+        print(f"{label}")
+        for path in routes:
+            status, first, median = time_route(client, path, args.runs)
+            print(f"  {path:<28} {status:>6} {first:>9.1f} {median:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Startup / First-Request Benchmark
+
+Starts a fresh interpreter per run (so nothing is already compiled) and times
+the first request to a handful of pages, in three configurations:
+
+    cold      no bytecode cache, no warm-up (templates compile on first hit)
+    bytecode  primed on-disk Jinja bytecode cache, no warm-up
+    warm      primed bytecode cache plus warm_templates() before serving
+
+Each configuration is repeated --runs times and the median is reported.
+
+    python3 utils/bench_startup.py [--runs 5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROUTES = ['/', '/login', '/register', '/privacy', '/words', '/words/grade-3-spelling-words']
+
+
+def child(warm):
+    """Runs inside the fresh interpreter: time startup and each route's first hit."""
+    from bench_app import load_app
+
+    start = time.perf_counter()
+    web_quiz = load_app()
+    timings = {'import': time.perf_counter() - start}
+    if warm:
+        start = time.perf_counter()
+        web_quiz.warm_templates()
+        timings['warm_templates'] = time.perf_counter() - start
+    client = web_quiz.app.test_client()
+    for path in ROUTES:
+        start = time.perf_counter()
+        resp = client.get(path)
+        timings[path] = time.perf_counter() - start
+        if resp.status_code != 200:
+            raise RuntimeError(f"{path}: HTTP {resp.status_code}")
+    print(json.dumps(timings))
+
+
+def run(cache_dir, warm):
+    env = dict(os.environ, JINJA_CACHE_DIR=cache_dir)
+    cmd = [sys.executable, __file__, '--child'] + (['--warm'] if warm else [])
+    out = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure first-request latency after startup.')
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per configuration')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--warm', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.warm)
+        return
+
+    cache_dir = tempfile.mkdtemp(prefix='spellaroo_jinja_')
+    run(cache_dir, warm=True)  # prime the bytecode cache
+    configs = [('cold', '', False), ('bytecode', cache_dir, False), ('warm', cache_dir, True)]
+
+    results = {}
+    for name, directory, warm in configs:
+        runs = [run(directory, warm) for _ in range(args.runs)]
+        results[name] = {key: statistics.median(r.get(key, 0) for r in runs) for key in runs[0]}
+
+    keys = ['import', 'warm_templates'] + ROUTES
+    print(f"median of {args.runs} fresh processes, milliseconds")
+    print(f"{'':<32}" + ''.join(f"{name:>10}" for name, _, _ in configs))
+    for key in keys:
+        print(f"{key:<32}" + ''.join(f"{results[name].get(key, 0) * 1000:>10.1f}" for name, _, _ in configs))
+    print(f"{'first requests':<32}"
+          + ''.join(f"{sum(results[name][p] for p in ROUTES) * 1000:>10.1f}" for name, _, _ in configs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build
+
+Copies every file in static/ to static/build/<name>.<hash>.<ext>, where <hash>
+is a short content hash, and writes static/build/manifest.json mapping the
+original filename to its fingerprinted path. web_quiz.py rewrites
+url_for('static', filename=...) through the manifest, and fingerprinted files
+are served with a one-year immutable Cache-Control, so a deploy that changes an
+asset changes its URL instead of waiting for caches to expire.
+
+Run from the main directory on every deploy (deploy.sh does this):
+
+    python3 utils/build_static.py
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), '..', 'static')
+BUILD_DIR = os.path.join(STATIC_DIR, 'build')
+MANIFEST_FILE = os.path.join(BUILD_DIR, 'manifest.json')
+
+
+def fingerprint(filename, data):
+    """style.css + contents -> style.1a2b3c4d5e.css"""
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest}{ext}"
+
+
+def build(verbose=False):
+    """Fingerprint all top-level static files and write the manifest. Returns the manifest."""
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    manifest = {}
+    for filename in sorted(os.listdir(STATIC_DIR)):
+        src = os.path.join(STATIC_DIR, filename)
+        if not os.path.isfile(src):
+            continue
+        with open(src, 'rb') as f:
+            data = f.read()
+        hashed = fingerprint(filename, data)
+        dest = os.path.join(BUILD_DIR, hashed)
+        # Older fingerprints are left in place so pages cached before this
+        # deploy can still load the assets they reference.
+        if not os.path.exists(dest):
+            shutil.copyfile(src, dest)
+        manifest[filename] = f"build/{hashed}"
+        if verbose:
+            print(f"  {filename} -> build/{hashed}")
+
+    tmp_file = MANIFEST_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, MANIFEST_FILE)
+    return manifest
+
+
+def main():
+    verbose = '--verbose' in sys.argv or '-v' in sys.argv
+    manifest = build(verbose)
+    print(f"Fingerprinted {len(manifest)} static files into static/build/")
+
+
+if __name__ == "__main__":
+    main()
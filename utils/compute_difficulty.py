@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Word Difficulty Job
+
+Recomputes the word_difficulty table from site-wide word_stats. Each word gets a
+smoothed miss rate: its own right/wrong tally shrunk toward a Bayesian prior
+pooled over words of the same grade and length. Web workers load the table into
+memory at startup (see wsgi.py), so the easy/hard/mixed quiz pools never
+aggregate word_stats per request.
+
+Run from the main directory (e.g. nightly from cron), then reload the workers:
+
+    SECRET_KEY=... python3 utils/compute_difficulty.py [--db quiz_sessions.db] [--top 10]
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path to import main modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import web_quiz
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute per-word difficulty scores.')
+    parser.add_argument('--db', default=web_quiz.DATABASE, help='SQLite database path')
+    parser.add_argument('--top', type=int, default=10, help='show the N hardest and easiest words')
+    args = parser.parse_args()
+
+    web_quiz.DATABASE = args.db
+    web_quiz.init_db()
+    count = web_quiz.refresh_word_difficulty()
+    web_quiz.load_word_difficulty()
+    print(f"Scored {count} words into {args.db}")
+
+    if args.top:
+        ranked = sorted(web_quiz.WORD_DIFFICULTY.items(), key=lambda kv: kv[1])
+        print(f"\nHardest {args.top}:")
+        for word, score in reversed(ranked[-args.top:]):
+            print(f"  {word:<20} {score:.3f}")
+        print(f"\nEasiest {args.top}:")
+        for word, score in ranked[:args.top]:
+            print(f"  {word:<20} {score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Classroom Load Test
+
+Simulates a whole class taking a quiz at once, the way our real peak looks:
+every student logs in, waits for the teacher's "go", starts the same quiz
+within a few seconds of each other (POST /setup, GET /quiz) and answers each
+word after a typing/think time drawn from a log-normal distribution, then
+opens the results page. One thread per student.
+
+Targets either the app in-process (Flask test client against a temp or
+--db database, CSRF and rate limits off) or a running server with --url. A
+server keeps CSRF on and the login rate limit (10 per minute per IP) applies;
+a class behind one school NAT address hits it the same way. Use --login-window
+to spread logins out. Students are student<N>@bench.invalid, created in --db,
+which must be the server's database for --url.
+
+Reports, per phase: requests, errors, non-2xx/3xx status codes, SQLite
+"database is locked" errors and latency percentiles. Lock errors are counted
+from the app's log records, including ones a view catches and hides behind a
+200 (a lost quiz result), so they are only available in-process.
+
+    python3 utils/load_classroom.py [--students 30] [--words 10] [--time-scale 0.1]
+    python3 utils/load_classroom.py --students 200 --db /tmp/seed_100k.db
+    python3 utils/load_classroom.py --url http://127.0.0.1:5000 --db quiz_sessions.db
+"""
+
+import re
+import math
+import time
+import random
+import sqlite3
+import logging
+import argparse
+import threading
+from collections import Counter, defaultdict
+
+from bench_app import load_app, ensure_user, BENCH_PASSWORD
+
+PHASES = ['login', 'setup', 'quiz page', 'answer', 'results']
+ENDPOINT_PHASES = {'login': 'login', 'setup': 'setup', 'quiz': 'quiz page',
+                   'submit_answer': 'answer', 'results': 'results'}
+CSRF_FIELD = re.compile(r'name="csrf_token" value="([^"]+)"')
+CSRF_META = re.compile(r'<meta name="csrf-token" content="([^"]+)"')
+CURRENT_WORD = re.compile(r'window\.currentWord = "([^"]*)"')
+
+
+class Response:
+    def __init__(self, status, text, data=None):
+        self.status, self.text, self.data = status, text, data
+
+
+class InProcessClient:
+    def __init__(self, web_quiz):
+        self.client = web_quiz.app.test_client()
+
+    def request(self, method, path, data=None, json=None, headers=None):
+        resp = self.client.open(path, method=method, data=data, json=json, headers=headers)
+        return Response(resp.status_code, resp.get_data(as_text=True), resp.get_json(silent=True))
+
+
+class HttpClient:
+    def __init__(self, base):
+        import requests
+        self.base = base
+        self.http = requests.Session()
+
+    def request(self, method, path, data=None, json=None, headers=None):
+        resp = self.http.request(method, self.base + path, data=data, json=json, headers=headers,
+                                 allow_redirects=False, timeout=60)
+        try:
+            body = resp.json() if 'json' in resp.headers.get('Content-Type', '') else None
+        except ValueError:
+            body = None
+        return Response(resp.status_code, resp.text, body)
+
+
+class LockErrorCounter(logging.Handler):
+    """Counts logged sqlite3 'database is locked' errors by the phase of the request."""
+
+    def __init__(self, web_quiz):
+        super().__init__()
+        self.web_quiz = web_quiz
+        self.counts = Counter()
+
+    def emit(self, record):
+        # Runs under the handler's own lock (logging.Handler.handle)
+        exc = record.exc_info[1] if record.exc_info else None
+        if isinstance(exc, sqlite3.OperationalError) and 'locked' in str(exc):
+            request = self.web_quiz.request
+            endpoint = request.endpoint if self.web_quiz.has_request_context() else None
+            self.counts[ENDPOINT_PHASES.get(endpoint, 'other')] += 1
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = Counter()
+        self.statuses = defaultdict(Counter)
+
+    def record(self, phase, seconds, status, expect=None):
+        with self.lock:
+            self.latencies[phase].append(seconds)
+            if status is None:
+                self.errors[phase] += 1
+                self.statuses[phase]['exception'] += 1
+            elif expect and status != expect:
+                self.errors[phase] += 1
+                self.statuses[phase][f'{status} (not {expect})'] += 1
+            elif status >= 400 or status < 200:
+                self.errors[phase] += status >= 400
+                self.statuses[phase][status] += 1
+
+
+def misspell(word, rng):
+    i = rng.randrange(len(word))
+    return word[:i] + word[i + 1:] if len(word) > 1 else word + word
+
+
+def student(n, make_client, args, go, results, seed):
+    """One student: log in, wait for go, take the quiz, open the results."""
+    rng = random.Random(seed)
+    client = make_client()
+    skill = rng.uniform(0.5, 0.95)
+    scale = args.time_scale
+
+    def call(phase, method, path, expect=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = client.request(method, path, **kwargs)
+        except Exception:
+            resp = None
+        results.record(phase, time.perf_counter() - start, resp.status if resp else None, expect)
+        return resp
+
+    time.sleep(rng.uniform(0, args.login_window))
+    page = call('login', 'GET', '/login')
+    token = CSRF_FIELD.search(page.text).group(1) if page and CSRF_FIELD.search(page.text) else ''
+    call('login', 'POST', '/login', data={'email': f'student{n}@bench.invalid',
+                                         'password': BENCH_PASSWORD, 'csrf_token': token})
+    # A failed or rate-limited login redirects too; only a logged-in student gets the setup page
+    page = call('login', 'GET', '/setup', expect=200)
+    match = CSRF_META.search(page.text) if page else None
+    token = match.group(1) if match else ''
+
+    go.wait()
+    if not page or page.status != 200:
+        return  # not logged in: sits this quiz out
+    for _ in range(args.rounds):
+        # Reading the instructions and clicking Start after the teacher says go
+        time.sleep(rng.uniform(0, 5) * scale)
+        call('setup', 'POST', '/setup', data={'grades': args.grades.split(','), 'word_type': 'r',
+                                              'num_words': str(args.words), 'csrf_token': token})
+        page = call('quiz page', 'GET', '/quiz')
+        match = CURRENT_WORD.search(page.text) if page else None
+        word = match.group(1) if match else ''
+        for _ in range(args.words):
+            time.sleep(rng.lognormvariate(math.log(args.think), 0.5) * scale)
+            answer = word if word and rng.random() < skill else misspell(word or 'x', rng)
+            resp = call('answer', 'POST', '/submit_answer', json={'answer': answer},
+                        headers={'X-CSRFToken': token})
+            data = resp.data if resp and resp.data else {}
+            if data.get('is_complete') or 'error' in data:
+                break
+            word = data.get('next_word', '')
+        time.sleep(rng.uniform(1, 3) * scale)
+        call('results', 'GET', '/results')
+
+
+def percentile(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def report(results, lock_counts, elapsed):
+    print(f"\nFinished in {elapsed:.1f}s. Latency in ms.")
+    print(f"{'phase':<10} {'requests':>8} {'errors':>7} {'err %':>6} {'locked':>7} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  non-2xx/3xx")
+    for phase in PHASES:
+        values = sorted(results.latencies.get(phase, []))
+        if not values:
+            continue
+        ms = lambda s: f"{s * 1000:>8.1f}"
+        locked = '-' if lock_counts is None else lock_counts.get(phase, 0)
+        statuses = ', '.join(f"{code}: {n}" for code, n in results.statuses[phase].most_common())
+        print(f"{phase:<10} {len(values):>8} {results.errors[phase]:>7} "
+              f"{results.errors[phase] / len(values) * 100:>6.1f} {locked:>7} "
+              f"{ms(percentile(values, 50))} {ms(percentile(values, 95))} {ms(percentile(values, 99))} "
+              f"{ms(values[-1])}  {statuses}")
+    if lock_counts is None:
+        print("\nlocked: SQLite lock errors are only counted in-process (no --url)")
+    elif lock_counts.get('other'):
+        print(f"\n{lock_counts['other']} lock errors outside the quiz phases")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate a classroom taking a quiz at the same time.')
+    parser.add_argument('--students', type=int, default=30, help='students in the class')
+    parser.add_argument('--words', type=int, default=10, help='words per quiz')
+    parser.add_argument('--rounds', type=int, default=1, help='quizzes per student')
+    parser.add_argument('--grades', default='3', help='comma-separated grades for the quiz')
+    parser.add_argument('--think', type=float, default=6.0, help='median seconds to type each answer')
+    parser.add_argument('--time-scale', type=float, default=0.1,
+                        help='multiply all think times (1 = real time)')
+    parser.add_argument('--login-window', type=float, default=0,
+                        help='spread logins over this many seconds before the go signal')
+    parser.add_argument('--url', help='running server, e.g. http://127.0.0.1:5000 (default: in-process)')
+    parser.add_argument('--db', help='database to create students in (the server\'s, with --url)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    args = parser.parse_args()
+    if args.url and not args.db:
+        parser.error('--url needs --db (the server\'s database) to create the student accounts')
+
+    web_quiz = load_app(args.db)
+    for n in range(args.students):
+        ensure_user(web_quiz, f'student{n}@bench.invalid', f'Student {n}')
+
+    if args.url:
+        make_client = lambda: HttpClient(args.url.rstrip('/'))
+        lock_counter = None
+    else:
+        make_client = lambda: InProcessClient(web_quiz)
+        lock_counter = LockErrorCounter(web_quiz)
+        # Ahead of the queue handler, which strips exc_info when it enqueues
+        web_quiz.log.handlers.insert(0, lock_counter)
+
+    results = Results()
+    go = threading.Barrier(args.students + 1)
+    threads = [threading.Thread(target=student, args=(n, make_client, args, go, results, args.seed * 100003 + n))
+               for n in range(args.students)]
+    target = args.url or f"in-process app ({web_quiz.DATABASE})"
+    print(f"{args.students} students x {args.rounds} quiz(zes) of {args.words} words against {target}")
+    for t in threads:
+        t.start()
+    go.wait()
+    print("Teacher says go")
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    report(results, lock_counter.counts if lock_counter else None, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
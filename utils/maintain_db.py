@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Database Maintenance Job
+
+Deletes quiz_state rows not updated for --ttl-days (abandoned quizzes keep
+their full word list and progress JSON forever otherwise), returns the freed
+pages to the filesystem with an incremental vacuum and runs PRAGMA optimize.
+The first run on a database created before auto_vacuum was enabled does a
+one-off full VACUUM to switch it on.
+
+Run from the main directory, e.g. nightly from cron:
+
+    SECRET_KEY=... python3 utils/maintain_db.py [--db quiz_sessions.db] [--ttl-days 7]
+
+    # /etc/cron.d/spelling-quiz (run as the web user so file ownership is kept)
+    30 3 * * * www-data cd /var/www/spelling-quiz && SECRET_KEY=... venv/bin/python3 utils/maintain_db.py
+"""
+
+import os
+import sys
+import argparse
+
+# Add parent directory to path to import main modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import web_quiz
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Expire abandoned quiz state and compact the database.')
+    parser.add_argument('--db', default=web_quiz.DATABASE, help='SQLite database path')
+    parser.add_argument('--ttl-days', type=float, default=web_quiz.QUIZ_STATE_TTL_DAYS,
+                        help='expire quiz_state rows idle for this many days')
+    args = parser.parse_args()
+
+    web_quiz.DATABASE = args.db
+    web_quiz.init_db()
+    report = web_quiz.maintain_database(args.ttl_days)
+
+    print(f"Expired {report['expired_rows']} quiz_state rows older than {args.ttl_days:g} days")
+    if report['converted_to_incremental']:
+        print("Switched the database to incremental auto-vacuum (one-off full VACUUM)")
+    print(f"Free pages before vacuum: {report['free_pages']}")
+    print(f"Database size: {report['bytes_before']:,} -> {report['bytes_after']:,} bytes "
+          f"({report['bytes_reclaimed']:,} reclaimed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Worker Startup Profiler
+
+Starts fresh interpreters that go through wsgi.py's startup step by step and
+reports what a newly spawned web worker costs:
+
+1. Import time per module (python -X importtime), rolled up by top-level
+   package, plus the slowest individual modules.
+2. Wall time of each startup step: importing web_quiz, init_db() (migrations
+   and backfills), load_word_difficulty(), warm_templates(),
+   prerender_word_pages() and build_sitemap().
+3. Resident memory after import and after warm-up, and which optional
+   libraries (the Google OAuth stack, brotli) ended up loaded.
+
+init_db() migrates and page/sitemap steps write to the database, so by
+default each run works on a fresh copy of web_quiz.DATABASE in a temp
+directory (or an empty database if there is none); --db uses the given file
+in place.
+
+With --google the child also serves one /auth/google redirect, showing what
+the first Google login adds now that those libraries load lazily.
+
+    python3 utils/profile_startup.py [--runs 3] [--top 15] [--db seed.db] [--google]
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+
+STEPS = ['load_word_difficulty', 'warm_templates', 'prerender_word_pages', 'build_sitemap']
+OPTIONAL_MODULES = ['google.auth', 'google_auth_oauthlib', 'requests', 'brotli']
+
+
+def rss_mb():
+    """Current resident set size (Linux /proc), else the peak from getrusage."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def child(db, google):
+    """Runs inside the fresh interpreter; prints one JSON line of timings."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    os.environ.setdefault('SECRET_KEY', 'profile-only-secret')
+    result = {'rss_start': rss_mb()}
+
+    start = time.perf_counter()
+    import web_quiz
+    result['import web_quiz'] = time.perf_counter() - start
+    result['rss_import'] = rss_mb()
+
+    if not db:
+        tmp = tempfile.TemporaryDirectory(prefix='profile_startup_')  # removed when the child exits
+        db = os.path.join(tmp.name, 'quiz_sessions.db')
+        if os.path.exists(web_quiz.DATABASE):
+            src, dst = sqlite3.connect(web_quiz.DATABASE), sqlite3.connect(db)
+            src.backup(dst)
+            src.close()
+            dst.close()
+    web_quiz.DATABASE = db
+    start = time.perf_counter()
+    web_quiz.init_db()
+    result['init_db'] = time.perf_counter() - start
+    for step in STEPS:
+        start = time.perf_counter()
+        getattr(web_quiz, step)()
+        result[step] = time.perf_counter() - start
+    result['rss_warm'] = rss_mb()
+
+    if google:
+        client = web_quiz.app.test_client()
+        start = time.perf_counter()
+        client.get('/auth/google')
+        result['first /auth/google'] = time.perf_counter() - start
+        result['rss_google'] = rss_mb()
+    result['loaded'] = [m for m in OPTIONAL_MODULES if m in sys.modules]
+    print(json.dumps(result))
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run(db, google):
+    cmd = [sys.executable, '-X', 'importtime', __file__, '--child'] + (['--db', db] if db else [])
+    cmd += ['--google'] if google else []
+    proc = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile web worker startup: imports, init_db, memory.')
+    parser.add_argument('--runs', type=int, default=3, help='fresh processes (medians are reported)')
+    parser.add_argument('--top', type=int, default=15, help='slowest modules and packages to list')
+    parser.add_argument('--db', help='SQLite database to use in place (default: a temp copy of web_quiz.DATABASE)')
+    parser.add_argument('--google', action='store_true', help='also time the first /auth/google request')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.db, args.google)
+        return
+
+    runs = [run(args.db, args.google) for _ in range(args.runs)]
+    results = [r for r, _ in runs]
+    median = lambda key: statistics.median(r[key] for r in results)
+
+    # Self time summed per top-level package; cumulative time per module
+    packages, modules = defaultdict(list), defaultdict(list)
+    for _, imports in runs:
+        per_package = defaultdict(int)
+        for name, (self_us, cumulative_us) in imports.items():
+            per_package[name.split('.')[0]] += self_us
+            modules[name].append(cumulative_us)
+        for name, total in per_package.items():
+            packages[name].append(total)
+    total_import_us = statistics.median(sum(s for s, _ in imports.values()) for _, imports in runs)
+
+    print(f"Median of {args.runs} fresh processes\n")
+    print(f"Imports by top-level package (self time, {total_import_us / 1000:.0f} ms in all)")
+    ranked = sorted(packages.items(), key=lambda kv: -statistics.median(kv[1]))
+    for name, values in ranked[:args.top]:
+        print(f"  {name:<32} {statistics.median(values) / 1000:>8.1f} ms")
+
+    print("\nSlowest modules (cumulative, including what they import)")
+    ranked = sorted(modules.items(), key=lambda kv: -statistics.median(kv[1]))
+    for name, values in ranked[:args.top]:
+        print(f"  {name:<48} {statistics.median(values) / 1000:>8.1f} ms")
+
+    print("\nStartup steps (wsgi.py order)")
+    steps = ['import web_quiz', 'init_db'] + STEPS + (['first /auth/google'] if args.google else [])
+    for step in steps:
+        print(f"  {step:<32} {median(step) * 1000:>8.1f} ms")
+    print(f"  {'total':<32} {sum(median(s) for s in steps) * 1000:>8.1f} ms")
+
+    print("\nResident memory")
+    labels = [('rss_start', 'interpreter'), ('rss_import', 'after import'), ('rss_warm', 'after warm-up')]
+    labels += [('rss_google', 'after Google login')] if args.google else []
+    for key, label in labels:
+        print(f"  {label:<32} {median(key):>8.1f} MB")
+    print(f"\nOptional libraries loaded: {', '.join(results[0]['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
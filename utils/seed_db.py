@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Synthetic Database Generator
+
+Builds a production-sized quiz_sessions.db for benchmarking: users with a
+home grade (weighted toward the elementary grades we actually serve), a
+skewed number of quiz sessions each (a few heavy users, a long tail of
+occasional ones), incorrect words and word_stats/word_review rows drawn from
+the real word_dictionary pools, saved preferences, admin audit-log rows and
+quiz_state rows left behind by abandoned quizzes (most past the expiry TTL).
+
+The schema comes from web_quiz.init_db(); every table is then filled with
+executemany in one transaction, so a 1M-session database takes minutes, not
+hours. Output is deterministic for a given --seed.
+
+    python3 utils/seed_db.py --sessions 10k  --db /tmp/seed_10k.db
+    python3 utils/seed_db.py --sessions 100k --db /tmp/seed_100k.db
+    python3 utils/seed_db.py --sessions 1m   --db /tmp/seed_1m.db
+
+then point a benchmark at it, e.g. python3 utils/bench_routes.py --db /tmp/seed_100k.db.
+Seeded users are student<N>@bench.invalid with bench_app.BENCH_PASSWORD,
+ordered by activity (student0 has the most sessions); the admin is the first
+ADMIN_EMAILS address. Benchmarks that play quizzes write to the database, so
+copy a fixture before reusing it for before/after comparisons.
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import random
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+
+from bench_app import load_app, ensure_user, BENCH_PASSWORD
+
+GRADES = ['k'] + list(range(1, 13))
+# Share of students per home grade
+GRADE_WEIGHTS = [10, 12, 13, 13, 12, 11, 8, 6, 5, 3, 3, 2, 2]
+# Share of quizzes per word type: random mix, sight only, non-sight only, 50/50
+WORD_TYPES, WORD_TYPE_WEIGHTS = ['r', 's', 'o', 'f'], [60, 20, 15, 5]
+QUIZ_LENGTHS = [5, 10, 10, 10, 15, 20, 25]
+AUDIT_ACTIONS = ['activate', 'deactivate', 'grant_admin', 'revoke_admin', 'reset_password',
+                 'export_user', 'bulk_export']
+FLUSH_ROWS = 20000
+
+
+def parse_count(text):
+    """'10k' -> 10000, '1m' -> 1000000, '2500' -> 2500"""
+    text = text.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def sessions_per_user(rng, users, sessions):
+    """Split `sessions` over `users` with a long-tailed (log-normal) skew, busiest first:
+    many students try a quiz or two, a few do 15-20x the average."""
+    weights = [min(rng.lognormvariate(0, 1.2), 40) for _ in range(users)]
+    scale = sessions / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in rng.sample(range(users), sessions - sum(counts)):
+        counts[i] += 1
+    return sorted(counts, reverse=True)
+
+
+def pick_grades(rng, home):
+    """Mostly the student's own grade; sometimes review, a stretch, or a band."""
+    i = GRADES.index(home)
+    roll = rng.random()
+    if roll < 0.70 or (roll < 0.85 and i == 0):
+        return [home]
+    if roll < 0.85:
+        return [GRADES[i - 1]]
+    if roll < 0.95:
+        return GRADES[i:i + 2]
+    return GRADES[max(0, i - 2):i + 1]
+
+
+def token(rng):
+    return base64.urlsafe_b64encode(rng.randbytes(24)).rstrip(b'=').decode()
+
+
+class Seeder:
+    """Buffers rows per INSERT statement and flushes them with executemany."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffers = {}
+        self.counts = Counter()
+
+    def add(self, table, sql, row):
+        rows = self.buffers.setdefault((table, sql), [])
+        rows.append(row)
+        if len(rows) >= FLUSH_ROWS:
+            self.flush(table, sql)
+
+    def flush(self, table=None, sql=None):
+        keys = [(table, sql)] if table else list(self.buffers)
+        for key in keys:
+            rows = self.buffers.pop(key, [])
+            if rows:
+                self.conn.executemany(key[1], rows)
+                self.counts[key[0]] += len(rows)
+
+
+INSERT_USER = '''INSERT INTO users (id, name, email, password_hash, birth_year, birth_month,
+                 auth_provider, created_at) VALUES (?, ?, ?, ?, ?, ?, 'local', ?)'''
+SESSION_COLUMNS = '''session_id, user_id, date_time, grades, word_type, total_words, correct_count,
+                     incorrect_count, incorrect_words, percentage, created_at'''
+INSERT_SESSION = f'INSERT INTO seed_sessions ({SESSION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+INSERT_WORD_STAT = 'INSERT INTO word_stats (user_id, word, correct, incorrect) VALUES (?, ?, ?, ?)'
+INSERT_REVIEW = '''INSERT INTO word_review (user_id, word, interval, ease, reps, due_at)
+                   VALUES (?, ?, ?, ?, ?, ?)'''
+INSERT_PREFS = 'INSERT INTO user_prefs (user_id, prefs) VALUES (?, ?)'
+INSERT_QUIZ_STATE = 'INSERT INTO quiz_state (quiz_id, user_id, config, updated_at) VALUES (?, ?, ?, ?)'
+INSERT_AUDIT = '''INSERT INTO audit_log (admin_id, admin_email, action, target_user_id, target_email,
+                  detail, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)'''
+
+
+def seed(web_quiz, conn, args):
+    rng = random.Random(args.seed)
+    random.seed(args.seed)  # build_word_pool's 50/50 mix samples from the global generator
+    now = datetime.now().replace(microsecond=0)
+    pools = {}
+
+    def pool(grades, word_type):
+        key = (tuple(grades), word_type)
+        if key not in pools:
+            pools[key] = sorted(web_quiz.build_word_pool(grades, word_type))
+        return pools[key]
+
+    admin_email = next(iter(sorted(web_quiz.ADMIN_EMAILS)))
+    admin_id = ensure_user(web_quiz, admin_email, 'Site Admin')
+    password_hash = web_quiz.hash_password(BENCH_PASSWORD)  # one hash shared by every seeded user
+    first_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM users').fetchone()[0]
+
+    # Sessions are generated user by user but stored in time order, so one
+    # student's rows are spread across the table as they are in production
+    conn.execute(f'CREATE TEMP TABLE seed_sessions AS SELECT {SESSION_COLUMNS} FROM sessions WHERE 0')
+    out = Seeder(conn)
+    counts = sessions_per_user(rng, args.users, args.sessions)
+    for n, session_count in enumerate(counts):
+        user_id = first_id + n
+        home = rng.choices(GRADES, GRADE_WEIGHTS)[0]
+        skill = rng.betavariate(8, 2)
+        joined = now - timedelta(days=rng.uniform(1, args.days), hours=rng.uniform(0, 24))
+        age = 6 + (0 if home == 'k' else home)
+        out.add('users', INSERT_USER, (
+            user_id, f'Student {n}', f'student{n}@bench.invalid', password_hash,
+            now.year - age, rng.randint(1, 12), joined.strftime('%Y-%m-%d %H:%M:%S')))
+
+        # Quizzes in school hours between joining and now, in id (= time) order
+        span = (now - joined).total_seconds()
+        times = sorted(joined + timedelta(seconds=rng.uniform(0, span)) for _ in range(session_count))
+        tally = {}
+        grades = word_type = None
+        for when in times:
+            when = when.replace(hour=rng.randint(8, 19))
+            grades = pick_grades(rng, home)
+            word_type = rng.choices(WORD_TYPES, WORD_TYPE_WEIGHTS)[0]
+            words = pool(grades, word_type)
+            total = min(rng.choice(QUIZ_LENGTHS), len(words))
+            missed = []
+            for word in rng.sample(words, total):
+                wrong = rng.random() < min(0.95, (1 - skill) * len(word) / 6)
+                if wrong:
+                    missed.append(word)
+                counts_for = tally.setdefault(word, [0, 0])
+                counts_for[wrong] += 1
+            correct = total - len(missed)
+            out.add('sessions', INSERT_SESSION, (
+                token(rng), user_id, when.isoformat(), json.dumps(grades), word_type, total,
+                correct, len(missed), json.dumps(missed), correct / total * 100 if total else 0,
+                when.strftime('%Y-%m-%d %H:%M:%S')))
+
+        for word, (correct, incorrect) in tally.items():
+            out.add('word_stats', INSERT_WORD_STAT, (user_id, word, correct, incorrect))
+            if incorrect:
+                reps = rng.randint(0, 4)
+                out.add('word_review', INSERT_REVIEW, (
+                    user_id, word, [0, 1, 6, 15, 40][reps], round(rng.uniform(1.3, 2.8), 2), reps,
+                    time.time() + rng.uniform(-14, 30) * 86400))
+        if grades:
+            out.add('user_prefs', INSERT_PREFS, (user_id, json.dumps(
+                {'grades': grades, 'word_type': word_type, 'num_words': 10, 'difficulty': None})))
+
+    # Abandoned quizzes: most idle past the expiry TTL, the rest recent
+    ttl = web_quiz.QUIZ_STATE_TTL_DAYS * 86400
+    for _ in range(args.quiz_states):
+        user_n = rng.randrange(args.users)
+        grades = [rng.choices(GRADES, GRADE_WEIGHTS)[0]]
+        words = rng.sample(pool(grades, 'r'), 10)
+        done = rng.randint(0, 9)
+        config = {'grades': grades, 'word_type': 'r', 'selected_words': words, 'current_word_index': done,
+                  'correct_answers': words[:done], 'incorrect_answers': [],
+                  'start_time': now.isoformat()}
+        idle = rng.uniform(ttl, 90 * 86400) if rng.random() < 0.8 else rng.uniform(0, ttl)
+        out.add('quiz_state', INSERT_QUIZ_STATE,
+                (token(rng), first_id + user_n, json.dumps(config), time.time() - idle))
+
+    for _ in range(args.audit):
+        user_n = rng.randrange(args.users)
+        action = rng.choice(AUDIT_ACTIONS)
+        when = now - timedelta(days=rng.uniform(0, args.days))
+        bulk = action == 'bulk_export'
+        out.add('audit_log', INSERT_AUDIT, (
+            admin_id, admin_email, action, None if bulk else first_id + user_n,
+            None if bulk else f'student{user_n}@bench.invalid', 'all users' if bulk else None,
+            when.strftime('%Y-%m-%d %H:%M:%S')))
+
+    out.flush()
+    conn.execute(f'INSERT INTO sessions ({SESSION_COLUMNS}) '
+                 f'SELECT {SESSION_COLUMNS} FROM seed_sessions ORDER BY date_time')
+    conn.execute('DROP TABLE seed_sessions')
+    return out.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a production-sized synthetic database.')
+    parser.add_argument('--db', required=True, help='SQLite database to create')
+    parser.add_argument('--sessions', type=parse_count, default=parse_count('10k'),
+                        help='total quiz sessions, e.g. 10k, 100k, 1m')
+    parser.add_argument('--users', type=parse_count, help='users (default: sessions / 50)')
+    parser.add_argument('--quiz-states', type=parse_count, help='abandoned quiz_state rows (default: users / 5)')
+    parser.add_argument('--audit', type=parse_count, help='audit_log rows (default: users / 10)')
+    parser.add_argument('--days', type=float, default=365, help='history length in days')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    parser.add_argument('--force', action='store_true', help='replace --db if it exists')
+    args = parser.parse_args()
+    args.users = args.users or max(1, args.sessions // 50)
+    args.quiz_states = args.quiz_states if args.quiz_states is not None else args.users // 5
+    args.audit = args.audit if args.audit is not None else args.users // 10
+
+    if os.path.exists(args.db):
+        if not args.force:
+            sys.exit(f"{args.db} exists; pass --force to replace it")
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+
+    start = time.perf_counter()
+    web_quiz = load_app(args.db)
+    with web_quiz.connect_db() as conn:
+        # A throwaway fixture: skip the rollback journal and fsyncs
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('BEGIN')
+        counts = seed(web_quiz, conn, args)
+        conn.commit()
+        conn.execute('ANALYZE')
+    elapsed = time.perf_counter() - start
+
+    for table in ('users', 'sessions', 'word_stats', 'word_review', 'user_prefs', 'quiz_state', 'audit_log'):
+        print(f"  {table:<12} {counts[table]:>10,}")
+    print(f"Wrote {args.db} ({os.path.getsize(args.db) / 1e6:.1f} MB) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Test the easy/hard/mixed difficulty filter on quiz word pools"""
+
+import os
+import sys
+
+os.environ.setdefault('SECRET_KEY', 'test-only-secret')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from web_quiz import build_word_pool, filter_by_difficulty, word_difficulty
+
+def test_small_pools_are_not_filtered():
+    """A pool too small to split into thirds comes back whole."""
+    for words in (['cat'], ['cat', 'elephant']):
+        for difficulty in ('easy', 'hard', 'mixed'):
+            assert filter_by_difficulty(words, difficulty) == words, (words, difficulty)
+    print("Small pools OK")
+
+def test_tiers():
+    """Easy and hard are the ends of the ranking; mixed keeps the whole pool."""
+    pool = build_word_pool([3], 'r')
+    ranked = sorted(pool, key=word_difficulty)
+    easy = filter_by_difficulty(pool, 'easy')
+    hard = filter_by_difficulty(pool, 'hard')
+    mixed = filter_by_difficulty(pool, 'mixed')
+    print(f"Grade 3: {len(pool)} words, easy {len(easy)}, hard {len(hard)}, mixed {len(mixed)}")
+    assert easy and hard
+    assert sorted(easy, key=word_difficulty) == ranked[:len(easy)]
+    assert sorted(hard, key=word_difficulty) == ranked[len(ranked) - len(hard):]
+    assert not set(easy) & set(hard)
+    assert sorted(mixed) == sorted(pool)
+    for size in range(3, 10):
+        words = ranked[:size]
+        assert sorted(filter_by_difficulty(words, 'mixed')) == sorted(words), size
+        assert filter_by_difficulty(words, 'easy') and filter_by_difficulty(words, 'hard'), size
+    print("Tiers OK")
+
+if __name__ == "__main__":
+    test_small_pools_are_not_filtered()
+    test_tiers()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Test the rolling week window of the CLI's session statistics"""
+
+import os
+import sys
+from datetime import date, timedelta
+
+os.environ['TESTING_MODE'] = '1'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from word_quiz import STATS_WINDOW_DAYS, _empty_session_stats, _prune_session_stats
+
+def test_week_window_boundary():
+    """The window holds exactly STATS_WINDOW_DAYS calendar days, today included."""
+    today = date.today()
+    stats = _empty_session_stats()
+    for age in range(STATS_WINDOW_DAYS + 2):
+        stats["days"][(today - timedelta(days=age)).isoformat()] = [1, 1, 1]
+
+    _prune_session_stats(stats)
+
+    oldest_kept = (today - timedelta(days=STATS_WINDOW_DAYS - 1)).isoformat()
+    first_dropped = (today - timedelta(days=STATS_WINDOW_DAYS)).isoformat()
+    print(f"Kept {len(stats['days'])} days, oldest {min(stats['days'])}")
+    assert len(stats["days"]) == STATS_WINDOW_DAYS
+    assert oldest_kept in stats["days"]
+    assert first_dropped not in stats["days"]
+    print("Week window boundary OK")
+
+if __name__ == "__main__":
+    test_week_window_boundary()
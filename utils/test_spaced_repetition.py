@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Test the SM-2 review schedule behind "Practice missed words" """
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_app import load_app, ensure_user, login
+
+web_quiz = load_app()
+DAY = 86400
+
+def review_row(user_id, word):
+    with web_quiz.connect_db() as conn:
+        return conn.execute('SELECT interval, ease, reps, due_at FROM word_review WHERE user_id = ? AND word = ?',
+                            (user_id, word)).fetchone()
+
+def test_miss_queues_word():
+    """A miss puts the word in the queue, due now, with lowered ease."""
+    uid = ensure_user(web_quiz, 'sm2-miss@test.invalid')
+    web_quiz.record_word_attempt(uid, 'elephant', False)
+    interval, ease, reps, due_at = review_row(uid, 'elephant')
+    print(f"After a miss: interval {interval}, ease {ease:.2f}, reps {reps}")
+    assert (interval, reps) == (0, 0)
+    assert abs(ease - 2.3) < 1e-9
+    assert due_at <= time.time()
+    assert web_quiz.get_due_reviews(uid) == ['elephant']
+
+    # A word that was never missed stays out of the queue
+    web_quiz.record_word_attempt(uid, 'cat', True)
+    assert review_row(uid, 'cat') is None
+    print("Miss OK")
+
+def test_correct_answers_grow_interval():
+    """Correct answers step the interval 1 -> 6 -> interval * ease days."""
+    uid = ensure_user(web_quiz, 'sm2-steps@test.invalid')
+    web_quiz.record_word_attempt(uid, 'because', False)
+    expected = [(1, 2.4), (6, 2.5), (15, 2.6), (39, 2.7)]
+    for reps, (interval, ease) in enumerate(expected, 1):
+        web_quiz.record_word_attempt(uid, 'because', True)
+        row = review_row(uid, 'because')
+        print(f"Correct #{reps}: interval {row[0]:g} days, ease {row[1]:.2f}")
+        assert row[2] == reps
+        assert abs(row[0] - interval) < 1e-9 and abs(row[1] - ease) < 1e-9
+        assert abs(row[3] - (time.time() + interval * DAY)) < 60
+    assert web_quiz.get_due_reviews(uid) == []
+
+    # Missing it again resets the schedule
+    web_quiz.record_word_attempt(uid, 'because', False)
+    interval, ease, reps, _ = review_row(uid, 'because')
+    assert (interval, reps) == (0, 0) and abs(ease - 2.5) < 1e-9
+    print("Interval steps OK")
+
+def test_concurrent_answers_are_not_lost():
+    """Answers recorded at the same time all land in word_stats and the schedule."""
+    uid = ensure_user(web_quiz, 'sm2-race@test.invalid')
+    web_quiz.record_word_attempt(uid, 'friend', False)
+    start = threading.Barrier(6)
+
+    def answer():
+        start.wait()
+        web_quiz.record_word_attempt(uid, 'friend', True)
+
+    threads = [threading.Thread(target=answer) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with web_quiz.connect_db() as conn:
+        correct, incorrect = conn.execute('SELECT correct, incorrect FROM word_stats WHERE user_id = ? AND word = ?',
+                                          (uid, 'friend')).fetchone()
+    reps = review_row(uid, 'friend')[2]
+    print(f"6 concurrent correct answers: word_stats {correct}/{incorrect}, reps {reps}")
+    assert (correct, incorrect, reps) == (6, 1, 6)
+    print("Concurrency OK")
+
+def test_practice_missed_uses_due_words():
+    """/practice_missed quizzes only due words, skipping ones gone from the dictionary."""
+    email = 'sm2-practice@test.invalid'
+    uid = ensure_user(web_quiz, email)
+    for word in ('people', 'laugh', 'enough'):
+        web_quiz.record_word_attempt(uid, word, False)
+    web_quiz.record_word_attempt(uid, 'enough', True)  # next due tomorrow
+    with web_quiz.connect_db() as conn:
+        # Most overdue, but no longer in the dictionary
+        conn.execute('INSERT INTO word_review (user_id, word, interval, ease, reps, due_at) VALUES (?, ?, 0, 2.3, 0, 0)',
+                     (uid, 'notaword'))
+        conn.commit()
+    assert web_quiz.get_due_reviews(uid, limit=2) == ['people', 'laugh']
+
+    client = login(web_quiz, email)
+    resp = client.get('/practice_missed')
+    assert resp.status_code == 302 and resp.location.endswith('/quiz'), resp.location
+    with client.session_transaction() as sess:
+        config = web_quiz.load_quiz_state(sess['quiz_id'], uid)
+    print(f"Practice quiz words: {config['selected_words']}")
+    assert sorted(config['selected_words']) == ['laugh', 'people']
+    print("Practice missed OK")
+
+if __name__ == "__main__":
+    test_miss_queues_word()
+    test_correct_answers_grow_interval()
+    test_concurrent_answers_are_not_lost()
+    test_practice_missed_uses_due_words()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+TTS Trace Report
+
+Summarizes the per-run JSONL traces word_quiz.py writes to tts_traces/:
+how often say() fell back to espeak (and why), the voice_files cache hit
+rate, Google synthesis latency, disk-write time, and the dead time a student
+hears (before the first sound and between component files).
+
+    python3 utils/tts_trace_report.py [--last 5] [trace.jsonl ...]
+"""
+
+import os
+import json
+import glob
+import argparse
+from collections import Counter
+
+# word_quiz.TTS_TRACE_DIR (not imported: that would start pygame)
+TTS_TRACE_DIR = 'tts_traces'
+
+
+def load_events(path):
+    events = []
+    with open(path) as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # torn last line from an interrupted run
+    return events
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else None
+
+
+def fmt_ms(values):
+    if not values:
+        return "-"
+    return (f"n={len(values)}  p50 {percentile(values, 50):.1f}  p95 {percentile(values, 95):.1f}  "
+            f"max {max(values):.1f} ms")
+
+
+def summarize(events):
+    says = [e for e in events if e['event'] == 'say']
+    lookups = [e for e in events if e['event'] == 'cache_lookup']
+    synth = [e for e in events if e['event'] == 'synthesis']
+    hits = sum(1 for e in lookups if e.get('hit'))
+    return {
+        'says': len(says),
+        'espeak': sum(1 for e in says if e.get('path') == 'espeak'),
+        'fallbacks': sum(1 for e in says if e.get('fallback')),
+        'lookups': len(lookups),
+        'hits': hits,
+        'say_ms': [e['ms'] for e in says],
+        'first_audio_ms': [e['first_audio_ms'] for e in says if 'first_audio_ms' in e],
+        'gap_ms': [gap for e in says for gap in e.get('gaps_ms', [])],
+        'parse_ms': [e['ms'] for e in events if e['event'] == 'parse'],
+        'lookup_ms': [e['ms'] for e in lookups],
+        'synth_ok_ms': [e['ms'] for e in synth if e.get('ok')],
+        'synth_failed': sum(1 for e in synth if not e.get('ok')),
+        'write_ms': [e['ms'] for e in events if e['event'] == 'disk_write'],
+        'playback_ms': [e['ms'] for e in events if e['event'] == 'playback'],
+        'reasons': Counter(e.get('reason') or e.get('error') for e in events
+                           if e['event'] in ('google_unavailable', 'synthesis_error')),
+    }
+
+
+def print_summary(s):
+    hit_rate = f"{s['hits'] / s['lookups'] * 100:.1f}%" if s['lookups'] else "-"
+    print(f"  say() calls:        {s['says']}  ({s['espeak']} via espeak, {s['fallbacks']} of them fallbacks)")
+    print(f"  cache hit rate:     {hit_rate}  ({s['hits']} of {s['lookups']} lookups)")
+    print(f"  say() total:        {fmt_ms(s['say_ms'])}")
+    print(f"  time to 1st sound:  {fmt_ms(s['first_audio_ms'])}")
+    print(f"  gaps between parts: {fmt_ms(s['gap_ms'])}")
+    print(f"  parse:              {fmt_ms(s['parse_ms'])}")
+    print(f"  cache lookup:       {fmt_ms(s['lookup_ms'])}")
+    print(f"  Google synthesis:   {fmt_ms(s['synth_ok_ms'])}  ({s['synth_failed']} failed)")
+    print(f"  disk writes:        {fmt_ms(s['write_ms'])}")
+    print(f"  playback:           {fmt_ms(s['playback_ms'])}")
+    if s['reasons']:
+        print("  Google unavailable because:")
+        for reason, count in s['reasons'].most_common(5):
+            print(f"    {count:>5}  {reason}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize word_quiz.py TTS traces.')
+    parser.add_argument('traces', nargs='*', help=f'trace files (default: all in {TTS_TRACE_DIR}/)')
+    parser.add_argument('--last', type=int, help='only the N most recent runs')
+    args = parser.parse_args()
+
+    paths = args.traces or sorted(glob.glob(os.path.join(TTS_TRACE_DIR, '*.jsonl')))
+    if args.last:
+        paths = paths[-args.last:]
+    if not paths:
+        print(f"No traces found in {TTS_TRACE_DIR}/ - play a quiz with word_quiz.py first.")
+        return
+
+    all_events = []
+    for path in paths:
+        events = load_events(path)
+        all_events.extend(events)
+        s = summarize(events)
+        hit_rate = f"{s['hits'] / s['lookups'] * 100:.0f}%" if s['lookups'] else "-"
+        first_sound = f"{percentile(s['first_audio_ms'], 50):.0f} ms" if s['first_audio_ms'] else "-"
+        print(f"{os.path.basename(path)}: {s['says']} says, cache {hit_rate}, "
+              f"{s['fallbacks']} espeak fallbacks, 1st sound p50 {first_sound}")
+
+    print(f"\nAll {len(paths)} runs")
+    print_summary(summarize(all_events))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Flask web application for the Spellaroo spelling quiz game
 """
 
 import os
+import re
 import sys
 import json
 import time
@@ -13,18 +14,32 @@ import secrets
 import sqlite3
 import hashlib
 import hmac
-from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
+import threading
+import gzip
+import bisect
+import cProfile
+import atexit
+import queue
+import logging
+import logging.handlers
+from collections import OrderedDict, Counter, defaultdict, deque
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+from flask import (Flask, render_template, request, jsonify, session, redirect, url_for, flash, g,
+                   has_request_context, send_from_directory, abort)
 from werkzeug.security import generate_password_hash, check_password_hash
+from jinja2 import FileSystemBytecodeCache
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from limits.storage import Storage
 
-# Google OAuth imports
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
-from google_auth_oauthlib.flow import Flow
-import requests
+# Optional: brotli response compression (gzip is used when it's unavailable)
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Add the current directory to Python path to import word_lists
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -55,13 +70,396 @@ app.config.update(
     SESSION_COOKIE_SAMESITE='Lax',
 )
 
+# ---- Response compression -------------------------------------------------------------
+# Slow school networks make bytes-on-the-wire our biggest latency source, so
+# text responses over a size threshold are compressed in-app (brotli when the
+# optional module is installed and the client accepts it, else gzip) and HTML
+# gets its indentation stripped. Registered first so it runs after every other
+# after_request hook. Streamed and already-encoded responses pass through.
+
+app.config.update(
+    COMPRESS_MIN_SIZE=int(os.environ.get('COMPRESS_MIN_SIZE', 500)),
+    MINIFY_HTML=os.environ.get('MINIFY_HTML', '1') != '0',
+)
+COMPRESS_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+    'application/json', 'application/xml', 'application/manifest+json', 'image/svg+xml',
+}
+
+def minify_html(html):
+    """Drop leading indentation and blank lines (skipped if whitespace-sensitive tags appear)."""
+    if '<pre' in html or '<textarea' in html:
+        return html
+    return '\n'.join(line.lstrip() for line in html.splitlines() if line.strip())
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+def choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    return 'gzip' if 'gzip' in accepted else None
+
+@app.after_request
+def compress_response(response):
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+    if response.mimetype == 'text/html' and app.config['MINIFY_HTML']:
+        response.set_data(minify_html(response.get_data(as_text=True)))
+    encoding = choose_encoding()
+    response.vary.add('Accept-Encoding')
+    if encoding is None or response.content_length < app.config['COMPRESS_MIN_SIZE']:
+        return response
+    response.set_data(compress_body(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    # The compressed bytes differ from the identity representation
+    if response.headers.get('ETag') and not response.headers['ETag'].startswith('W/'):
+        response.headers['ETag'] = 'W/' + response.headers['ETag']
+    return response
+
+# ---- Structured logging ----------------------------------------------------------------
+# Application log records are JSON lines carrying the request id (taken from an
+# X-Request-ID header set by the proxy, else generated, and echoed back), user
+# id, route and time into the request. The request thread only enqueues them:
+# a QueueListener thread per process formats and writes to stderr (the Apache
+# error log under mod_wsgi) or LOG_FILE, so a slow disk never stalls a request.
+# When the queue is full records are dropped and counted, not waited on.
+# With LOG_LEVEL=DEBUG, debug records (including a summary of every request)
+# are kept for a LOG_DEBUG_SAMPLE fraction of requests, all or nothing per
+# request; slow or failed requests are logged at any level.
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FILE = os.environ.get('LOG_FILE', '')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+LOG_DEBUG_SAMPLE = float(os.environ.get('LOG_DEBUG_SAMPLE', '0.01'))
+LOG_SLOW_REQUEST_MS = float(os.environ.get('LOG_SLOW_REQUEST_MS', '1000'))
+_REQUEST_ID = re.compile(r'^[\w.@:-]{1,64}$')
+
+log = logging.getLogger('spellaroo')
+log.setLevel(LOG_LEVEL)
+log.propagate = False
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record; context fields are attached by _LogContextFilter."""
+
+    def format(self, record):
+        entry = {'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+                 'level': record.levelname, 'msg': record.getMessage(), 'pid': record.process}
+        for key in ('request_id', 'user_id', 'route', 'method', 'path', 'elapsed_ms'):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        entry.update(getattr(record, 'data', None) or {})
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class _LogContextFilter(logging.Filter):
+    """Runs on the request thread: stamps request context and applies debug sampling."""
+
+    def filter(self, record):
+        if has_request_context():
+            if record.levelno <= logging.DEBUG and not g.get('log_sampled'):
+                return False
+            record.request_id = g.get('request_id')
+            # dict.get: reading flask.session would mark it accessed and add Vary: Cookie
+            record.user_id = dict.get(session._get_current_object(), 'user_id')
+            record.route = request.endpoint
+            record.method = request.method
+            record.path = request.path
+            if 'request_started' in g:
+                record.elapsed_ms = round((time.perf_counter() - g.request_started) * 1000, 1)
+        elif record.levelno <= logging.DEBUG and random.random() >= LOG_DEBUG_SAMPLE:
+            return False
+        return True
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    dropped = 0
+
+    def prepare(self, record):
+        # Keep the message and traceback as text; the formatter runs on the listener
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if _log_listener_pid != os.getpid():
+            _start_log_listener()  # listener threads don't survive a fork
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
+
+def _log_output_handler():
+    handler = logging.handlers.WatchedFileHandler(LOG_FILE) if LOG_FILE else logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonLogFormatter())
+    return handler
+
+_log_handler = _NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+_log_handler.addFilter(_LogContextFilter())
+log.addHandler(_log_handler)
+_log_listener = None
+_log_listener_pid = None
+_log_listener_lock = threading.Lock()
+
+def _start_log_listener():
+    global _log_listener, _log_listener_pid
+    with _log_listener_lock:
+        if _log_listener_pid == os.getpid():
+            return
+        _log_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        _log_listener = logging.handlers.QueueListener(_log_handler.queue, _log_output_handler())
+        _log_listener.start()
+        _log_listener_pid = os.getpid()
+
+def stop_log_listener():
+    """Flush queued records and stop the writer thread (registered with atexit)."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None and _log_listener_pid == os.getpid():
+            _log_listener.stop()
+            _log_listener = None
+
+_start_log_listener()
+atexit.register(stop_log_listener)
+
+@app.before_request
+def start_request_log():
+    incoming = request.headers.get('X-Request-ID', '')
+    g.request_id = incoming if _REQUEST_ID.match(incoming) else secrets.token_hex(8)
+    g.log_sampled = random.random() < LOG_DEBUG_SAMPLE
+
+@app.after_request
+def add_request_id_header(response):
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+@app.teardown_request
+def log_request(exc):
+    # Registered before the metrics hooks, so this teardown runs after theirs
+    if 'request_started' not in g:
+        return
+    status = 500 if exc is not None else g.get('response_status', 500)
+    elapsed_ms = (time.perf_counter() - g.request_started) * 1000
+    if status >= 500:
+        level = logging.ERROR
+    elif elapsed_ms >= LOG_SLOW_REQUEST_MS:
+        level = logging.WARNING
+    else:
+        level = logging.DEBUG
+    log.log(level, 'request', exc_info=exc,
+            extra={'data': {'status': status, 'db_ms': round(g.get('db_time', 0.0) * 1000, 1)}})
+
+# ---- Request metrics -------------------------------------------------------------------
+# Per-endpoint latency and DB-time histograms, status counts and an in-flight
+# gauge, aggregated in-process under one lock (shared by all of a worker's
+# threads) and served in Prometheus text format at /admin/metrics. Each worker
+# process keeps its own numbers. Registered before CSRF and the limiter so
+# requests they reject are counted too. Streamed responses are timed until the
+# view returns, not until the last byte is sent.
+
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+class _Histogram:
+    __slots__ = ('buckets', 'total', 'count')
+
+    def __init__(self):
+        self.buckets = [0] * len(METRICS_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect.bisect_left(METRICS_BUCKETS, value)
+        if i < len(self.buckets):
+            self.buckets[i] += 1
+        self.total += value
+        self.count += 1
+
+_metrics_lock = threading.Lock()
+_request_latency = defaultdict(_Histogram)   # endpoint -> seconds
+_request_db_time = defaultdict(_Histogram)   # endpoint -> seconds spent in SQLite
+_request_status = Counter()                  # (endpoint, status) -> count
+_requests_in_flight = 0
+METRICS_STARTED_AT = time.time()
+
+def add_db_time(seconds):
+    """Charge SQLite time to the current request (no-op outside requests)."""
+    if has_request_context() and 'db_time' in g:
+        g.db_time += seconds
+
+@app.before_request
+def start_request_metrics():
+    global _requests_in_flight
+    g.request_started = time.perf_counter()
+    g.db_time = 0.0
+    with _metrics_lock:
+        _requests_in_flight += 1
+
+@app.after_request
+def note_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def record_request_metrics(exc):
+    global _requests_in_flight
+    if 'request_started' not in g:
+        return
+    elapsed = time.perf_counter() - g.request_started
+    status = 500 if exc is not None else g.get('response_status', 500)
+    endpoint = request.endpoint or 'unmatched'
+    with _metrics_lock:
+        _requests_in_flight -= 1
+        _request_latency[endpoint].observe(elapsed)
+        _request_db_time[endpoint].observe(g.db_time)
+        _request_status[(endpoint, status)] += 1
+
+def _copy_histogram(h):
+    copy = _Histogram()
+    copy.buckets, copy.total, copy.count = list(h.buckets), h.total, h.count
+    return copy
+
+def _histogram_lines(name, histograms):
+    lines = []
+    for endpoint, h in sorted(histograms.items()):
+        cumulative = 0
+        for le, n in zip(METRICS_BUCKETS, h.buckets):
+            cumulative += n
+            lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="+Inf"}} {h.count}')
+        lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {h.total:.6f}')
+        lines.append(f'{name}_count{{endpoint="{endpoint}"}} {h.count}')
+    return lines
+
+def render_metrics():
+    """This worker's metrics in Prometheus text exposition format."""
+    with _metrics_lock:
+        latency = {e: _copy_histogram(h) for e, h in _request_latency.items()}
+        db_time = {e: _copy_histogram(h) for e, h in _request_db_time.items()}
+        status = dict(_request_status)
+        in_flight = _requests_in_flight
+    lines = ['# HELP spellaroo_request_duration_seconds Request latency by endpoint.',
+             '# TYPE spellaroo_request_duration_seconds histogram']
+    lines += _histogram_lines('spellaroo_request_duration_seconds', latency)
+    lines += ['# HELP spellaroo_request_db_seconds SQLite time per request by endpoint.',
+              '# TYPE spellaroo_request_db_seconds histogram']
+    lines += _histogram_lines('spellaroo_request_db_seconds', db_time)
+    lines += ['# HELP spellaroo_requests_total Responses by endpoint and status code.',
+              '# TYPE spellaroo_requests_total counter']
+    lines += [f'spellaroo_requests_total{{endpoint="{e}",status="{code}"}} {n}'
+              for (e, code), n in sorted(status.items())]
+    lines += ['# HELP spellaroo_requests_in_flight Requests currently being handled.',
+              '# TYPE spellaroo_requests_in_flight gauge',
+              f'spellaroo_requests_in_flight {in_flight}',
+              '# HELP spellaroo_process_start_time_seconds When this worker started collecting.',
+              '# TYPE spellaroo_process_start_time_seconds gauge',
+              f'spellaroo_process_start_time_seconds {METRICS_STARTED_AT:.3f}']
+    return '\n'.join(lines) + '\n'
+
 # CSRF protection for all state-changing POSTs (forms send a hidden csrf_token;
 # AJAX sends it via the X-CSRFToken header — see base.html).
 csrf = CSRFProtect(app)
 
-# Rate limiting (brute-force protection on auth routes). In-memory storage is
-# fine for a single gunicorn host; move to Redis if scaled to multiple workers/hosts.
-limiter = Limiter(get_remote_address, app=app, default_limits=[])
+# Rate limiting (brute-force protection on auth routes). Counters live in a
+# small SQLite file so every worker process on the host shares them; set
+# RATELIMIT_STORAGE_URI (e.g. memory:// or redis://...) to use another backend.
+
+class SQLiteLimiterStorage(Storage):
+    """Fixed-window rate limit counters in a local SQLite table (WAL mode).
+
+    One row per limit key; incr() is a single upsert, so concurrent workers
+    never lose a hit. Expired rows are deleted at most every
+    COMPACT_INTERVAL seconds per process, keeping the table the size of the
+    currently active windows rather than growing with every client IP.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+    COMPACT_INTERVAL = 60
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        self.path = uri[len('sqlite://'):] if uri else 'rate_limits.db'
+        self._local = threading.local()
+        self._next_compact = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self):
+        # Per thread, and reopened after a fork (connections must not cross processes)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Counters don't need to survive power loss; skip the fsync per hit
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS rate_limits (
+                                key TEXT PRIMARY KEY,
+                                count INTEGER NOT NULL,
+                                expires_at REAL NOT NULL
+                            ) WITHOUT ROWID''')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _compact(self, now):
+        if now >= self._next_compact:
+            self._next_compact = now + self.COMPACT_INTERVAL
+            self._conn().execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        # limits 3.x (still allowed by Flask-Limiter>=3.5) passes elastic_expiry;
+        # when set, every hit pushes the window end out again
+        now = time.time()
+        self._compact(now)
+        row = self._conn().execute('''
+            INSERT INTO rate_limits (key, count, expires_at) VALUES (:key, :amount, :expires_at)
+            ON CONFLICT(key) DO UPDATE SET
+                count = CASE WHEN expires_at <= :now THEN excluded.count ELSE count + excluded.count END,
+                expires_at = CASE WHEN :elastic OR expires_at <= :now THEN excluded.expires_at ELSE expires_at END
+            RETURNING count
+        ''', {'key': key, 'amount': amount, 'expires_at': now + expiry, 'now': now,
+              'elastic': bool(elastic_expiry)}).fetchone()
+        return row[0]
+
+    def get(self, key):
+        row = self._conn().execute('SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?',
+                                   (key, time.time())).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        row = self._conn().execute('SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?',
+                                   (key, time.time())).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self):
+        try:
+            self._conn().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._conn().execute('DELETE FROM rate_limits').rowcount
+
+    def clear(self, key):
+        self._conn().execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+RATELIMIT_STORAGE_URI = os.environ.get(
+    'RATELIMIT_STORAGE_URI',
+    'sqlite://' + os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rate_limits.db'))
+limiter = Limiter(get_remote_address, app=app, default_limits=[], storage_uri=RATELIMIT_STORAGE_URI)
 
 # Google OAuth Configuration
 GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID', '')
@@ -72,10 +470,37 @@ if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
     # Development mode - these will need to be replaced with real credentials
     GOOGLE_CLIENT_ID = "your-google-client-id.apps.googleusercontent.com"
     GOOGLE_CLIENT_SECRET = "your-google-client-secret"
-    print("WARNING: Using default Google OAuth credentials. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET environment variables for production.")
+    log.warning("Using default Google OAuth credentials. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET environment variables for production.")
+
+# Outbound calls to Google (token exchange, signing certs) hold a request
+# thread, so bound them and reuse one keep-alive session across logins.
+GOOGLE_HTTP_TIMEOUT = float(os.environ.get('GOOGLE_HTTP_TIMEOUT', '10'))
+
+# The Google libraries (google-auth, google-auth-oauthlib, requests) are
+# imported by the OAuth routes on first use rather than at startup, so workers
+# that never serve a Google login don't pay for loading them.
+_google_auth_request = None
+_google_auth_lock = threading.Lock()
+
+def google_auth_request():
+    """Shared google-auth transport with a keep-alive session and bounded timeout."""
+    global _google_auth_request
+    with _google_auth_lock:
+        if _google_auth_request is None:
+            import requests
+            from google.auth.transport import requests as google_requests
+
+            class _GoogleAuthRequest(google_requests.Request):
+                def __call__(self, url, method='GET', body=None, headers=None, timeout=None, **kwargs):
+                    return super().__call__(url, method=method, body=body, headers=headers,
+                                            timeout=timeout or GOOGLE_HTTP_TIMEOUT, **kwargs)
+
+            _google_auth_request = _GoogleAuthRequest(requests.Session())
+    return _google_auth_request
 
 def create_google_oauth_flow():
     """Create Google OAuth flow"""
+    from google_auth_oauthlib.flow import Flow
     flow = Flow.from_client_config(
         {
             "web": {
@@ -97,6 +522,61 @@ def create_google_oauth_flow():
     flow.redirect_uri = url_for('google_callback', _external=True)
     return flow
 
+# ---- Template compilation cache ------------------------------------------------------
+# Compiled template bytecode is kept on disk and shared by all workers, so a
+# freshly spawned worker loads it instead of recompiling every template on its
+# first hits. Set JINJA_CACHE_DIR='' to disable. wsgi.py calls warm_templates()
+# so the compile/load happens before the first request rather than during it.
+
+JINJA_CACHE_DIR = os.environ.get('JINJA_CACHE_DIR',
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), '.jinja_cache'))
+if JINJA_CACHE_DIR:
+    try:
+        os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+    except OSError as e:
+        log.warning("Jinja bytecode cache disabled (%s: %s)", JINJA_CACHE_DIR, e)
+
+def warm_templates():
+    """Load (compile or fetch from the bytecode cache) every template. Returns the count."""
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+# ---- Fingerprinted static assets ------------------------------------------------------
+# utils/build_static.py copies static/ files to static/build/<name>.<hash>.<ext>
+# and writes a manifest. Templates' url_for('static', ...) resolves through it,
+# and those URLs are cached by browsers for a year. Without a build (dev), the
+# plain filenames are used.
+
+STATIC_MANIFEST_FILE = os.path.join(app.static_folder, 'build', 'manifest.json')
+STATIC_IMMUTABLE_MAX_AGE = 31536000
+
+def load_static_manifest():
+    try:
+        with open(STATIC_MANIFEST_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+STATIC_MANIFEST = load_static_manifest()
+
+def asset_url_for(endpoint, **values):
+    """url_for that swaps static filenames for their fingerprinted build path."""
+    if endpoint == 'static' and values.get('filename') in STATIC_MANIFEST:
+        values['filename'] = STATIC_MANIFEST[values['filename']]
+    return url_for(endpoint, **values)
+
+app.jinja_env.globals['url_for'] = asset_url_for
+
+@app.after_request
+def cache_fingerprinted_assets(response):
+    """Fingerprinted files never change under the same URL, so cache them forever."""
+    if request.endpoint == 'static' and (request.view_args or {}).get('filename', '').startswith('build/'):
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable'
+    return response
+
 @app.context_processor
 def inject_globals():
     """Expose common values (current year, login state) to all templates."""
@@ -119,13 +599,311 @@ def from_json_filter(s):
 
 # Database setup
 DATABASE = 'quiz_sessions.db'
+# Stored in PRAGMA user_version by init_db(); bump when init_db() changes the schema
+SCHEMA_VERSION = 1
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that charges statement and fetch time to the current request."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - start
+            add_db_time(elapsed)
+            profile_query(self.connection, sql, parameters, elapsed)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed = time.perf_counter() - start
+            add_db_time(elapsed)
+            profile_query(self.connection, sql, None, elapsed)
+
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            add_db_time(time.perf_counter() - start)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            add_db_time(time.perf_counter() - start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            add_db_time(time.perf_counter() - start)
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose statements and commits (the fsyncs) are timed; see connect_db()."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            add_db_time(time.perf_counter() - start)
+
+    def __exit__(self, *exc_info):
+        # `with conn:` commits (or rolls back) here without calling commit()
+        start = time.perf_counter()
+        try:
+            return super().__exit__(*exc_info)
+        finally:
+            add_db_time(time.perf_counter() - start)
+
+def connect_db():
+    """Open the app database with per-request DB timing."""
+    return sqlite3.connect(DATABASE, factory=TimedConnection)
+
+# ---- Query profiler --------------------------------------------------------------------
+# Every statement run through connect_db() inside a request is normalized to a
+# fingerprint (literals and placeholder lists collapsed) and counted per
+# request; at teardown the request's counts are merged into per-worker totals.
+# A fingerprint called many times in one request is an N+1 pattern. Statements
+# slower than SLOW_QUERY_MS are printed with their EXPLAIN QUERY PLAN and kept
+# in a short in-memory log. Totals are shown at /admin/diagnostics.
+
+QUERY_PROFILE = os.environ.get('QUERY_PROFILE', '1') != '0'
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_LOG_SIZE = 100
+
+_query_lock = threading.Lock()
+_query_stats = {}                                  # fingerprint -> totals dict
+_endpoint_queries = defaultdict(lambda: [0, 0, 0])  # endpoint -> [requests, queries, max per request]
+_slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SQL_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+@lru_cache(maxsize=1024)
+def query_fingerprint(sql):
+    """'SELECT * FROM t WHERE id IN (?, ?, 3)' -> 'SELECT * FROM t WHERE id IN (?+)'"""
+    fp = _SQL_STRING.sub('?', ' '.join(sql.split()))
+    fp = _SQL_NUMBER.sub('?', fp)
+    return _SQL_LIST.sub('(?+)', fp)
+
+def profile_query(conn, sql, parameters, elapsed):
+    """Count a statement against the current request; log it if slow.
+    `parameters` is None for executemany (no plan is captured)."""
+    if not QUERY_PROFILE or not has_request_context():
+        return
+    fp = query_fingerprint(sql)
+    queries = g.setdefault('queries', {})
+    entry = queries.get(fp)
+    if entry is None:
+        entry = queries[fp] = [0, 0.0, 0.0]
+    entry[0] += 1
+    entry[1] += elapsed
+    entry[2] = max(entry[2], elapsed)
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        log_slow_query(conn, sql, fp, parameters, elapsed)
+
+def log_slow_query(conn, sql, fp, parameters, elapsed):
+    plan = []
+    if parameters is not None:
+        try:
+            # Base-class execute: not timed or profiled itself
+            rows = sqlite3.Connection.execute(conn, 'EXPLAIN QUERY PLAN ' + sql, parameters).fetchall()
+            plan = [row[-1] for row in rows]
+        except sqlite3.Error:
+            pass
+    entry = {'at': datetime.now().isoformat(timespec='seconds'), 'endpoint': request.endpoint or 'unmatched',
+             'ms': elapsed * 1000, 'sql': fp, 'plan': plan}
+    with _query_lock:
+        _slow_queries.append(entry)
+    log.warning('slow query', extra={'data': {'query_ms': round(entry['ms'], 1), 'sql': fp, 'plan': plan}})
+
+@app.teardown_request
+def record_query_profile(exc):
+    if 'request_started' not in g:
+        return
+    queries = g.pop('queries', {})
+    endpoint = request.endpoint or 'unmatched'
+    total = sum(calls for calls, _, _ in queries.values())
+    with _query_lock:
+        ep = _endpoint_queries[endpoint]
+        ep[0] += 1
+        ep[1] += total
+        ep[2] = max(ep[2], total)
+        for fp, (calls, seconds, worst) in queries.items():
+            stats = _query_stats.get(fp)
+            if stats is None:
+                stats = _query_stats[fp] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                            'max_per_request': 0, 'endpoints': Counter()}
+            stats['calls'] += calls
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], worst)
+            stats['max_per_request'] = max(stats['max_per_request'], calls)
+            stats['endpoints'][endpoint] += calls
+
+def query_profile_snapshot():
+    """Copy of the profiler totals for display: (queries, endpoints, slow)."""
+    with _query_lock:
+        queries = [dict(stats, fingerprint=fp, endpoints=stats['endpoints'].most_common(3))
+                   for fp, stats in _query_stats.items()]
+        endpoints = [{'endpoint': e, 'requests': n, 'queries': q, 'max_per_request': worst}
+                     for e, (n, q, worst) in _endpoint_queries.items()]
+        slow = list(reversed(_slow_queries))
+    queries.sort(key=lambda q: q['seconds'], reverse=True)
+    endpoints.sort(key=lambda e: e['queries'] / e['requests'], reverse=True)
+    return queries, endpoints, slow
+
+def reset_query_profile():
+    with _query_lock:
+        _query_stats.clear()
+        _endpoint_queries.clear()
+        _slow_queries.clear()
+
+# ---- On-demand request profiler --------------------------------------------------------
+# An admin adds ?_profile=1 (or the X-Spellaroo-Profile header) to any URL to
+# run that one request under a stack sampler; the collapsed stacks
+# (flamegraph.pl / speedscope "folded" format) are written to PROFILE_DIR.
+# ?_profile=cprofile records a deterministic cProfile .prof instead (snakeviz,
+# pstats). Any other value (e.g. ?_profile=0) is ignored. Only the newest
+# PROFILE_KEEP files are kept. The file's timestamp
+# prefix is returned in the X-Spellaroo-Profile response header;
+# /admin/diagnostics lists and downloads them.
+
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         'diagnostics', 'profiles'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '50'))
+PROFILE_SAMPLE_INTERVAL = 0.001
+PROFILE_MODES = {'1': 'stacks', 'stacks': 'stacks', 'cprofile': 'cprofile'}
+_PROFILE_NAME = re.compile(r'^(\d{8}T\d{6}-\d{6})_([\w.]+)_(\d+)ms\.(folded|prof)$')
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+@app.before_request
+def start_request_profile():
+    mode = PROFILE_MODES.get(request.args.get('_profile') or request.headers.get('X-Spellaroo-Profile', ''))
+    if not mode or 'user_id' not in session or not is_admin_user(session['user_id'], fresh=True):
+        return
+    g.profile_started = time.perf_counter()
+    g.profile_stamp = datetime.now().strftime('%Y%m%dT%H%M%S-%f')
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g.profiler = profiler
+            return
+        except ValueError:
+            pass  # another cProfile is running (3.12+ allows one per process); sample instead
+    g.profiler = StackSampler(threading.get_ident())
+    g.profiler.start()
+
+@app.after_request
+def announce_request_profile(response):
+    if 'profiler' in g:
+        response.headers['X-Spellaroo-Profile'] = g.profile_stamp
+    return response
+
+@app.teardown_request
+def save_request_profile(exc):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+    elapsed_ms = int((time.perf_counter() - g.profile_started) * 1000)
+    endpoint = request.endpoint or 'unmatched'
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+            path = os.path.join(PROFILE_DIR, f'{g.profile_stamp}_{endpoint}_{elapsed_ms}ms.folded')
+            with open(path, 'w') as f:
+                f.write(profiler.folded())
+        else:
+            profiler.disable()
+            path = os.path.join(PROFILE_DIR, f'{g.profile_stamp}_{endpoint}_{elapsed_ms}ms.prof')
+            profiler.dump_stats(path)
+        for old in list_profiles()[PROFILE_KEEP:]:
+            os.remove(os.path.join(PROFILE_DIR, old['name']))
+    except OSError:
+        log.exception("Error saving request profile")
+
+def list_profiles():
+    """Saved profiles, newest first: [{'name', 'at', 'endpoint', 'ms', 'kind', 'size'}]."""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except OSError:
+        return []
+    profiles = []
+    for name in names:
+        m = _PROFILE_NAME.match(name)
+        if not m:
+            continue
+        try:
+            size = os.path.getsize(os.path.join(PROFILE_DIR, name))
+        except OSError:
+            continue
+        at = datetime.strptime(m.group(1), '%Y%m%dT%H%M%S-%f')
+        profiles.append({'name': name, 'at': at, 'endpoint': m.group(2), 'ms': int(m.group(3)),
+                         'kind': 'cProfile' if m.group(4) == 'prof' else 'stacks', 'size': size})
+    profiles.sort(key=lambda p: p['name'], reverse=True)
+    return profiles
 
 # Emails that are always granted admin (seeded at init and on registration)
 ADMIN_EMAILS = {'henrykoren@gmail.com'}
 
 def init_db():
     """Initialize the database"""
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
+        # Lets maintain_database() hand freed pages back to the filesystem.
+        # Only takes effect on a new, empty database; existing ones are
+        # converted by the first maintenance run.
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
         conn.execute('''
             CREATE TABLE IF NOT EXISTS sessions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -144,6 +922,9 @@ def init_db():
             )
         ''')
         
+        # Per-user session lookups (statistics, profile, stats ETag)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_id, id)')
+
         # Create users table with Google OAuth support
         conn.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -208,7 +989,7 @@ def init_db():
                         VALUES (?, ?, ?, ?, ?, ?, 'local')
                     ''', user)
         except Exception as e:
-            print(f"Migration warning: {e}")
+            log.warning("Migration warning: %s", e)
 
         # Server-side quiz state: keeps the answer list off the client cookie.
         # The cookie only holds an opaque quiz_id token.
@@ -221,6 +1002,7 @@ def init_db():
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
         ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_quiz_state_updated ON quiz_state (updated_at)')
 
         # Per-user saved quiz preferences (remembers last setup choices).
         conn.execute('''
@@ -256,6 +1038,50 @@ def init_db():
                 except (json.JSONDecodeError, TypeError):
                     pass
 
+        # Spaced-repetition review queue (SM-2) for words a user has missed.
+        # interval is in days; due_at is epoch seconds so the practice set is a
+        # single (user_id, due_at) index range scan.
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS word_review (
+                user_id INTEGER,
+                word TEXT,
+                interval REAL DEFAULT 0,
+                ease REAL DEFAULT 2.5,
+                reps INTEGER DEFAULT 0,
+                due_at REAL,
+                PRIMARY KEY (user_id, word)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_word_review_due ON word_review (user_id, due_at)')
+        # One-time seed from the historical tally: every missed word is due now.
+        if not conn.execute('SELECT 1 FROM word_review LIMIT 1').fetchone():
+            conn.execute('''
+                INSERT OR IGNORE INTO word_review (user_id, word, interval, ease, reps, due_at)
+                SELECT user_id, word, 0, 2.5, 0, ? FROM word_stats
+                WHERE incorrect > 0 AND user_id IS NOT NULL
+            ''', (time.time(),))
+
+        # Precomputed per-word difficulty (smoothed miss rate), refreshed offline
+        # by utils/compute_difficulty.py and loaded into memory at worker start.
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS word_difficulty (
+                word TEXT PRIMARY KEY,
+                score REAL,
+                attempts INTEGER,
+                computed_at TEXT
+            )
+        ''')
+
+        # Content hash of each public word-list page and when it last changed
+        # (sitemap <lastmod> / Last-Modified); see load_page_versions()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS page_versions (
+                page TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            )
+        ''')
+
         # Admin columns on users (is_admin, is_active)
         for col, ddl in [('is_admin', 'ALTER TABLE users ADD COLUMN is_admin INTEGER DEFAULT 0'),
                          ('is_active', 'ALTER TABLE users ADD COLUMN is_active INTEGER DEFAULT 1')]:
@@ -282,35 +1108,37 @@ def init_db():
         for admin_email in ADMIN_EMAILS:
             conn.execute('UPDATE users SET is_admin = 1 WHERE email = ?', (admin_email,))
 
+        # Record that this schema is in place (checked by /readyz)
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         conn.commit()
 
 def log_admin_action(action, target_user_id=None, target_email=None, detail=None):
     """Record an admin action to the audit log."""
     try:
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             conn.execute('''
                 INSERT INTO audit_log (admin_id, admin_email, action, target_user_id, target_email, detail)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (session.get('user_id'), session.get('user_email'), action,
                   target_user_id, target_email, detail))
             conn.commit()
-    except Exception as e:
-        print(f"Error writing audit log: {e}")
+    except Exception:
+        log.exception("Error writing audit log")
 
 def count_admins():
     """Number of active admin accounts (used to prevent removing the last admin)."""
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         return conn.execute('SELECT COUNT(*) FROM users WHERE is_admin = 1').fetchone()[0]
 
 def save_user_prefs(user_id, prefs):
     """Remember a user's last quiz setup (grades, word type, count)."""
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         conn.execute('INSERT OR REPLACE INTO user_prefs (user_id, prefs) VALUES (?, ?)',
                      (user_id, json.dumps(prefs)))
         conn.commit()
 
 def load_user_prefs(user_id):
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         row = conn.execute('SELECT prefs FROM user_prefs WHERE user_id = ?', (user_id,)).fetchone()
     return json.loads(row[0]) if row else None
 
@@ -319,7 +1147,7 @@ def get_user_misses(user_id, limit=None):
     Returns a list of (word, count)."""
     from collections import Counter
     counter = Counter()
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         rows = conn.execute('SELECT incorrect_words FROM sessions WHERE user_id = ?', (user_id,)).fetchall()
     for (blob,) in rows:
         try:
@@ -332,19 +1160,78 @@ def get_user_misses(user_id, limit=None):
     return items
 
 def record_word_attempt(user_id, word, is_correct):
-    """Increment the per-user per-word correct/incorrect tally."""
+    """Increment the per-user per-word correct/incorrect tally and reschedule
+    the word's spaced-repetition review, in one transaction."""
     if not user_id:
         return
     col = 'correct' if is_correct else 'incorrect'
     other = 'incorrect' if is_correct else 'correct'
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         conn.execute(f'''
             INSERT INTO word_stats (user_id, word, {col}, {other})
             VALUES (?, ?, 1, 0)
             ON CONFLICT(user_id, word) DO UPDATE SET {col} = {col} + 1
         ''', (user_id, word))
+        _schedule_review(conn, user_id, word, is_correct)
         conn.commit()
 
+# ---- Spaced repetition (SM-2) ---------------------------------------------------------
+
+REVIEW_MIN_EASE = 1.3
+REVIEW_BATCH = 20
+
+def _schedule_review(conn, user_id, word, is_correct):
+    """Update a word's SM-2 schedule after an attempt (caller commits).
+
+    A miss (re)enters the word into the user's queue, due immediately, and
+    lowers its ease. A correct answer on a queued word grows the interval
+    (1 day, 6 days, then interval * ease). Words the user has never missed
+    stay out of the queue. Each case is a single statement computed from the
+    stored row, so concurrent answers can't overwrite each other's update.
+    """
+    params = {'user_id': user_id, 'word': word, 'now': time.time(), 'min_ease': REVIEW_MIN_EASE}
+    if is_correct:
+        conn.execute('''
+            UPDATE word_review SET
+                reps = reps + 1,
+                interval = CASE reps WHEN 0 THEN 1 WHEN 1 THEN 6 ELSE interval * ease END,
+                ease = ease + 0.1,
+                due_at = :now + 86400 * CASE reps WHEN 0 THEN 1 WHEN 1 THEN 6 ELSE interval * ease END
+            WHERE user_id = :user_id AND word = :word
+        ''', params)
+    else:
+        conn.execute('''
+            INSERT INTO word_review (user_id, word, interval, ease, reps, due_at)
+            VALUES (:user_id, :word, 0, MAX(:min_ease, 2.5 - 0.2), 0, :now)
+            ON CONFLICT(user_id, word) DO UPDATE SET
+                interval = 0, reps = 0, ease = MAX(:min_ease, ease - 0.2), due_at = :now
+        ''', params)
+
+def get_due_reviews(user_id, limit=REVIEW_BATCH):
+    """Words due for review now, most overdue first.
+
+    Words since dropped from the dictionary are skipped before the limit is
+    applied, so they can't leave a practice set short.
+    """
+    words = []
+    with connect_db() as conn:
+        rows = conn.execute('''
+            SELECT word FROM word_review WHERE user_id = ? AND due_at <= ?
+            ORDER BY due_at
+        ''', (user_id, time.time()))
+        for (w,) in rows:
+            if w in word_dictionary:
+                words.append(w)
+                if len(words) == limit:
+                    break
+    return words
+
+def next_review_at(user_id):
+    """Epoch seconds of the user's next scheduled review, or None if the queue is empty."""
+    with connect_db() as conn:
+        row = conn.execute('SELECT MIN(due_at) FROM word_review WHERE user_id = ?', (user_id,)).fetchone()
+    return row[0] if row else None
+
 def build_word_cloud(n=100):
     """Pick n random words and attach site-wide accuracy + a green→red color.
 
@@ -355,7 +1242,7 @@ def build_word_cloud(n=100):
     keys = list(word_dictionary.keys())
     sample = random.sample(keys, min(n, len(keys)))
 
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         qmarks = ','.join('?' * len(sample))
         rows = conn.execute(
             f'''SELECT word, SUM(correct), SUM(incorrect) FROM word_stats
@@ -409,7 +1296,7 @@ def compute_streak(dates):
 
 def save_quiz_state(quiz_id, user_id, config):
     """Persist quiz config (word list, progress) server-side, keyed by opaque token."""
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         conn.execute(
             'INSERT OR REPLACE INTO quiz_state (quiz_id, user_id, config, updated_at) VALUES (?, ?, ?, ?)',
             (quiz_id, user_id, json.dumps(config), time.time())
@@ -420,7 +1307,7 @@ def load_quiz_state(quiz_id, user_id):
     """Load a quiz config, but only if it belongs to this user."""
     if not quiz_id:
         return None
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         row = conn.execute(
             'SELECT config FROM quiz_state WHERE quiz_id = ? AND user_id = ?',
             (quiz_id, user_id)
@@ -431,10 +1318,51 @@ def clear_quiz_state(quiz_id):
     """Remove a finished/abandoned quiz's server-side state."""
     if not quiz_id:
         return
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         conn.execute('DELETE FROM quiz_state WHERE quiz_id = ?', (quiz_id,))
         conn.commit()
 
+# ---- Database maintenance (offline job, see utils/maintain_db.py) ---------------------
+
+# Quizzes untouched for this long are treated as abandoned
+QUIZ_STATE_TTL_DAYS = float(os.environ.get('QUIZ_STATE_TTL_DAYS', '7'))
+
+def _db_pages(conn):
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+    freelist = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    return page_size, page_count, freelist
+
+def maintain_database(ttl_days=QUIZ_STATE_TTL_DAYS):
+    """Expire abandoned quiz_state rows, return free pages to the filesystem and
+    refresh query-planner statistics. Returns a report dict."""
+    with connect_db() as conn:
+        page_size, pages_before, _ = _db_pages(conn)
+        cutoff = time.time() - ttl_days * 86400
+        expired = conn.execute('DELETE FROM quiz_state WHERE updated_at < ? OR updated_at IS NULL',
+                               (cutoff,)).rowcount
+        conn.commit()
+        free_pages = _db_pages(conn)[2]
+
+        # auto_vacuum can only be switched on by rebuilding the file once
+        converted = conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2
+        if converted:
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+        else:
+            # execute() would only step it once (one page); executescript runs it to completion
+            conn.executescript('PRAGMA incremental_vacuum;')
+        _, pages_after, _ = _db_pages(conn)
+        conn.execute('PRAGMA optimize')
+    return {
+        'expired_rows': expired,
+        'free_pages': free_pages,
+        'converted_to_incremental': converted,
+        'bytes_before': pages_before * page_size,
+        'bytes_after': pages_after * page_size,
+        'bytes_reclaimed': (pages_before - pages_after) * page_size,
+    }
+
 def compare_spellings(correct_word, user_input):
     """Return the correct word with correctly-placed chars lowercase and
     wrong/missing chars UPPERCASE, via edit-distance alignment. Ported from the
@@ -474,8 +1402,99 @@ def compare_spellings(correct_word, user_input):
 
     return "".join(c if ok else c.upper() for c, ok in reversed(alignment))
 
-def build_word_pool(grades, word_type):
-    """Build word pool based on grade levels and word type"""
+# ---- Word difficulty model ------------------------------------------------------------
+
+# In-memory copy of the word_difficulty table: word -> smoothed miss rate (0..1).
+WORD_DIFFICULTY = {}
+
+# Pseudo-attempts of prior weight: how much evidence it takes to move a word
+# (or a grade/length group) away from its prior.
+DIFFICULTY_PRIOR_WEIGHT = 10
+
+def _difficulty_group(word):
+    """(grade, length bucket) used to pool evidence for the Bayesian prior."""
+    grade = word_dictionary[word]['grade_levels'][0]
+    grade = 0 if grade == 'k' else grade
+    return grade, min(len(word), 10) // 2
+
+def _base_difficulty(word):
+    """Data-free prior: longer words and higher grades are missed more often."""
+    grade, _ = _difficulty_group(word)
+    return min(0.9, 0.05 + 0.03 * len(word) + 0.02 * grade)
+
+def compute_word_difficulty(conn):
+    """Compute a smoothed difficulty score for every dictionary word.
+
+    Site-wide word_stats are pooled per (grade, length) group to get a group
+    miss rate (itself shrunk toward the data-free base prior), and each word's
+    own tally is then shrunk toward its group rate. Returns
+    {word: (score, attempts)}.
+    """
+    tallies = {w: (c or 0, i or 0) for w, c, i in conn.execute(
+        'SELECT word, SUM(correct), SUM(incorrect) FROM word_stats GROUP BY word')
+        if w in word_dictionary}
+
+    groups = {}
+    for w, (c, i) in tallies.items():
+        g = groups.setdefault(_difficulty_group(w), [0, 0])
+        g[0] += i
+        g[1] += c + i
+
+    m = DIFFICULTY_PRIOR_WEIGHT
+    scores = {}
+    for w in word_dictionary:
+        missed, attempts = groups.get(_difficulty_group(w), (0, 0))
+        prior = (missed + m * _base_difficulty(w)) / (attempts + m)
+        c, i = tallies.get(w, (0, 0))
+        scores[w] = ((i + m * prior) / (c + i + m), c + i)
+    return scores
+
+def refresh_word_difficulty():
+    """Recompute the word_difficulty table (offline job). Returns the row count."""
+    with connect_db() as conn:
+        scores = compute_word_difficulty(conn)
+        now = datetime.now().isoformat()
+        conn.execute('DELETE FROM word_difficulty')
+        conn.executemany('INSERT INTO word_difficulty (word, score, attempts, computed_at) VALUES (?, ?, ?, ?)',
+                         [(w, s, a, now) for w, (s, a) in scores.items()])
+        conn.commit()
+    return len(scores)
+
+def load_word_difficulty():
+    """Load precomputed difficulty scores into WORD_DIFFICULTY (call at worker start)."""
+    try:
+        with connect_db() as conn:
+            rows = conn.execute('SELECT word, score FROM word_difficulty').fetchall()
+    except sqlite3.OperationalError:
+        rows = []  # table not created yet
+    WORD_DIFFICULTY.clear()
+    WORD_DIFFICULTY.update(rows)
+    return len(WORD_DIFFICULTY)
+
+def word_difficulty(word):
+    """Difficulty score for a word, falling back to the base prior if not computed."""
+    score = WORD_DIFFICULTY.get(word)
+    return score if score is not None else _base_difficulty(word)
+
+def filter_by_difficulty(words, difficulty):
+    """Narrow a word pool to its 'easy'/'hard' third, or an even 'mixed' spread
+    of all three tiers. Any other value, or a pool too small to split into
+    thirds, returns the pool unchanged."""
+    if difficulty not in ('easy', 'hard', 'mixed') or len(words) < 3:
+        return words
+    ranked = sorted(words, key=word_difficulty)
+    # Round the outer tiers up so the medium tier is never the largest
+    third = (len(ranked) + 2) // 3
+    easy, medium, hard = ranked[:third], ranked[third:len(ranked) - third], ranked[len(ranked) - third:]
+    if difficulty == 'easy':
+        return easy
+    if difficulty == 'hard':
+        return hard
+    # Mixed: all three tiers, so no word in the pool is dropped
+    return easy + medium + hard
+
+def build_word_pool(grades, word_type, difficulty=None):
+    """Build word pool based on grade levels, word type and (optional) difficulty"""
     sight_words = []
     non_sight_words = []
     
@@ -509,8 +1528,73 @@ def build_word_pool(grades, word_type):
         result = sight_words + non_sight_words
     else:
         result = []
-    
-    return result
+
+    return filter_by_difficulty(result, difficulty)
+
+# ---- Per-user statistics cache --------------------------------------------------------
+# /statistics and /api/stats share one per-worker cache keyed by user id. Each
+# entry remembers the user's last session id, which doubles as the ETag, so a
+# write from another worker is still noticed by a cheap MAX(id) lookup.
+
+STATS_CACHE_SIZE = 1024
+_stats_cache = OrderedDict()
+_stats_cache_lock = threading.Lock()
+
+def last_session_id(user_id):
+    with connect_db() as conn:
+        return conn.execute('SELECT MAX(id) FROM sessions WHERE user_id = ?', (user_id,)).fetchone()[0] or 0
+
+def stats_etag(user_id, last_id):
+    return f'stats-{user_id}-{last_id}'
+
+def invalidate_user_stats(user_id):
+    with _stats_cache_lock:
+        _stats_cache.pop(user_id, None)
+
+def compute_user_stats(user_id):
+    """Recent sessions, overall aggregates and top misses as plain JSON-able data."""
+    with connect_db() as conn:
+        conn.row_factory = sqlite3.Row
+        recent_sessions = [dict(r) for r in conn.execute('''
+            SELECT id, date_time, grades, word_type, total_words, correct_count,
+                   incorrect_count, incorrect_words, percentage, created_at
+            FROM sessions
+            WHERE user_id = ?
+            ORDER BY created_at DESC
+            LIMIT 20
+        ''', (user_id,))]
+        overall_stats = dict(conn.execute('''
+            SELECT
+                COUNT(*) as total_sessions,
+                AVG(percentage) as avg_percentage,
+                SUM(total_words) as total_words_attempted,
+                SUM(correct_count) as total_correct
+            FROM sessions
+            WHERE user_id = ?
+        ''', (user_id,)).fetchone())
+    top_missed = [
+        {'word': w, 'count': c, 'definition': word_dictionary[w]['definition']}
+        for w, c in get_user_misses(user_id, limit=10)
+    ]
+    return {'recent_sessions': recent_sessions, 'overall_stats': overall_stats,
+            'top_missed': top_missed}
+
+def get_user_stats(user_id, last_id=None):
+    """Cached compute_user_stats; recomputed whenever the user's last session id moves."""
+    if last_id is None:
+        last_id = last_session_id(user_id)
+    with _stats_cache_lock:
+        entry = _stats_cache.get(user_id)
+        if entry and entry[0] == last_id:
+            _stats_cache.move_to_end(user_id)
+            return entry[1]
+    stats = compute_user_stats(user_id)
+    with _stats_cache_lock:
+        _stats_cache[user_id] = (last_id, stats)
+        _stats_cache.move_to_end(user_id)
+        while len(_stats_cache) > STATS_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+    return stats
 
 def save_session_data(session_id, grades, word_type, total_words, correct_count, incorrect_count, incorrect_words):
     """Save quiz session data to database"""
@@ -518,7 +1602,7 @@ def save_session_data(session_id, grades, word_type, total_words, correct_count,
         percentage = (correct_count / total_words * 100) if total_words > 0 else 0
         user_id = session.get('user_id')
         
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             conn.execute('''
                 INSERT INTO sessions 
                 (session_id, user_id, date_time, grades, word_type, total_words, correct_count, incorrect_count, incorrect_words, percentage)
@@ -536,8 +1620,9 @@ def save_session_data(session_id, grades, word_type, total_words, correct_count,
                 percentage
             ))
             conn.commit()
-    except Exception as e:
-        print(f"Error saving session data: {e}")
+        invalidate_user_stats(user_id)
+    except Exception:
+        log.exception("Error saving session data")
 
 def normalize_email(email):
     """Lowercase + strip so Kid@X.com and kid@x.com map to one account."""
@@ -564,7 +1649,7 @@ def create_user(name, email, password=None, birth_year=None, birth_month=None, g
         password_hash = hash_password(password) if password else None
         is_admin = 1 if email in ADMIN_EMAILS else 0
 
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO users (name, email, password_hash, birth_year, birth_month, google_id, auth_provider, is_admin)
@@ -574,8 +1659,8 @@ def create_user(name, email, password=None, birth_year=None, birth_month=None, g
             return cursor.lastrowid
     except sqlite3.IntegrityError:
         return None  # Email already exists
-    except Exception as e:
-        print(f"Error creating user: {e}")
+    except Exception:
+        log.exception("Error creating user")
         return None
 
 def create_google_user(name, email, google_id):
@@ -585,7 +1670,7 @@ def create_google_user(name, email, google_id):
 def get_user_by_google_id(google_id):
     """Get user by Google ID"""
     try:
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, email, birth_year, birth_month, google_id, auth_provider
@@ -604,15 +1689,15 @@ def get_user_by_google_id(google_id):
                     'auth_provider': user[6]
                 }
             return None
-    except Exception as e:
-        print(f"Error getting user by Google ID: {e}")
+    except Exception:
+        log.exception("Error getting user by Google ID")
         return None
 
 def get_user_by_email(email):
     """Get user by email address"""
     try:
         email = normalize_email(email)
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, email, birth_year, birth_month, google_id, auth_provider
@@ -631,18 +1716,18 @@ def get_user_by_email(email):
                     'auth_provider': user[6]
                 }
             return None
-    except Exception as e:
-        print(f"Error getting user by email: {e}")
+    except Exception:
+        log.exception("Error getting user by email")
         return None
 
 def authenticate_user(email, password):
     """Authenticate user by email and password (local auth only)"""
     try:
         email = normalize_email(email)
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, name, email, password_hash, birth_year, birth_month, auth_provider, is_active
+                SELECT id, name, email, password_hash, birth_year, birth_month, auth_provider, is_active, is_admin
                 FROM users WHERE email = ? AND auth_provider = 'local'
             ''', (email,))
             user = cursor.fetchone()
@@ -660,17 +1745,18 @@ def authenticate_user(email, password):
                     'birth_year': user[4],
                     'birth_month': user[5],
                     'auth_provider': user[6],
-                    'is_active': user[7] if user[7] is not None else 1
+                    'is_active': user[7] if user[7] is not None else 1,
+                    'is_admin': bool(user[8])
                 }
             return None
-    except Exception as e:
-        print(f"Error authenticating user: {e}")
+    except Exception:
+        log.exception("Error authenticating user")
         return None
 
 def get_user_by_id(user_id):
     """Get user information by ID"""
     try:
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, email, birth_year, birth_month, google_id, auth_provider
@@ -689,8 +1775,8 @@ def get_user_by_id(user_id):
                     'auth_provider': user[6]
                 }
             return None
-    except Exception as e:
-        print(f"Error getting user: {e}")
+    except Exception:
+        log.exception("Error getting user")
         return None
 
 def login_required(f):
@@ -704,13 +1790,65 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-def is_admin_user(user_id):
-    """True if the given user id is an active admin."""
+# ---- Authorization cache --------------------------------------------------------------
+# Role checks run on every template render (navbar admin link), so they are
+# answered from, in order: a per-worker TTL cache, then the role flag stamped
+# into the signed session cookie. Admin changes invalidate both for this
+# worker; other workers pick the change up within AUTH_CACHE_TTL seconds.
+# admin_required always re-reads the database, so admin pages never trust a
+# stale grant.
+
+AUTH_CACHE_TTL = 60
+AUTH_CACHE_SIZE = 4096
+_role_cache = {}        # user_id -> (checked_at, is_admin)
+_role_invalidated = {}  # user_id -> time this worker last saw a role change
+_role_lock = threading.Lock()
+
+def stamp_session_role(is_admin, checked_at=None):
+    """Record the current user's admin flag (and when it was read) in the session."""
+    session['role'] = [bool(is_admin), checked_at or time.time()]
+
+def invalidate_role(*user_ids):
+    """Forget cached role flags after an admin changes a user's admin/active state."""
+    now = time.time()
+    with _role_lock:
+        for uid in user_ids:
+            _role_cache.pop(uid, None)
+            _role_invalidated[uid] = now
+        for uid, ts in list(_role_invalidated.items()):
+            if now - ts > AUTH_CACHE_TTL:
+                del _role_invalidated[uid]
+
+def is_admin_user(user_id, fresh=False):
+    """True if the given user id is an active admin.
+
+    Served from the role cache / session stamp unless fresh=True, which forces
+    a database read (and refreshes both).
+    """
     if not user_id:
         return False
-    with sqlite3.connect(DATABASE) as conn:
+    now = time.time()
+    own = has_request_context() and session.get('user_id') == user_id
+    if not fresh:
+        with _role_lock:
+            cached = _role_cache.get(user_id)
+            changed_at = _role_invalidated.get(user_id, 0)
+        if cached and now - cached[0] < AUTH_CACHE_TTL:
+            return cached[1]
+        stamp = session.get('role') if own else None
+        if stamp and now - stamp[1] < AUTH_CACHE_TTL and stamp[1] > changed_at:
+            return stamp[0]
+
+    with connect_db() as conn:
         row = conn.execute('SELECT is_admin, is_active FROM users WHERE id = ?', (user_id,)).fetchone()
-    return bool(row and row[0] and (row[1] if row[1] is not None else 1))
+    flag = bool(row and row[0] and (row[1] if row[1] is not None else 1))
+    with _role_lock:
+        if len(_role_cache) >= AUTH_CACHE_SIZE:
+            _role_cache.clear()
+        _role_cache[user_id] = (now, flag)
+    if own:
+        stamp_session_role(flag, now)
+    return flag
 
 def admin_required(f):
     """Require an authenticated, active admin (layered on top of login)."""
@@ -720,7 +1858,7 @@ def admin_required(f):
     def decorated_function(*args, **kwargs):
         if 'user_id' not in session:
             return redirect(url_for('login'))
-        if not is_admin_user(session['user_id']):
+        if not is_admin_user(session['user_id'], fresh=True):
             flash('You do not have permission to access that page.', 'error')
             return redirect(url_for('index'))
         return f(*args, **kwargs)
@@ -749,6 +1887,7 @@ def login():
                 session['user_id'] = user['id']
                 session['user_name'] = user['name']
                 session['user_email'] = user['email']
+                stamp_session_role(user['is_admin'])
                 flash('Login successful!', 'success')
                 return redirect(url_for('index'))
             else:
@@ -827,8 +1966,8 @@ def google_login():
         # generated here and must be replayed in the callback's token exchange.
         session['code_verifier'] = flow.code_verifier
         return redirect(authorization_url)
-    except Exception as e:
-        print(f"Google OAuth error: {e}")
+    except Exception:
+        log.exception("Google OAuth error")
         flash('Google login is not available. Please use email/password login.', 'error')
         return redirect(url_for('login'))
 
@@ -842,14 +1981,14 @@ def google_callback():
         
         flow = create_google_oauth_flow()
         flow.code_verifier = session.get('code_verifier')
-        flow.fetch_token(authorization_response=request.url)
+        flow.fetch_token(authorization_response=request.url, timeout=GOOGLE_HTTP_TIMEOUT)
         
         credentials = flow.credentials
-        request_session = google_requests.Request()
         
         # Verify the token and get user info
+        from google.oauth2 import id_token
         idinfo = id_token.verify_oauth2_token(
-            credentials.id_token, request_session, GOOGLE_CLIENT_ID
+            credentials.id_token, google_auth_request(), GOOGLE_CLIENT_ID
         )
         
         google_user_id = idinfo['sub']
@@ -879,8 +2018,8 @@ def google_callback():
                     return redirect(url_for('login'))
         
         if user:
-            with sqlite3.connect(DATABASE) as conn:
-                row = conn.execute('SELECT is_active FROM users WHERE id = ?', (user['id'],)).fetchone()
+            with connect_db() as conn:
+                row = conn.execute('SELECT is_active, is_admin FROM users WHERE id = ?', (user['id'],)).fetchone()
             if row and row[0] is not None and not row[0]:
                 flash('This account has been deactivated. Contact the site administrator.', 'error')
                 return redirect(url_for('login'))
@@ -888,6 +2027,7 @@ def google_callback():
             session['user_name'] = user['name']
             session['user_email'] = user['email']
             session['auth_provider'] = 'google'
+            stamp_session_role(row and row[1])
             flash(f'Welcome, {user["name"]}!', 'success')
             return redirect(url_for('index'))
         else:
@@ -895,11 +2035,11 @@ def google_callback():
             return redirect(url_for('login'))
             
     except ValueError as e:
-        print(f"Token verification failed: {e}")
+        log.warning("Token verification failed: %s", e)
         flash('Google authentication failed', 'error')
         return redirect(url_for('login'))
-    except Exception as e:
-        print(f"Google OAuth callback error: {e}")
+    except Exception:
+        log.exception("Google OAuth callback error")
         flash('Google login failed. Please try again.', 'error')
         return redirect(url_for('login'))
 
@@ -916,7 +2056,7 @@ def profile():
     streak = 0
     badges = []
     try:
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT COUNT(*), AVG(percentage), SUM(total_words), SUM(correct_count)
@@ -950,8 +2090,8 @@ def profile():
         if user_stats['average_score'] >= 90 and tq >= 5:
             badges.append(('🌟', 'Spelling Star'))
         if streak >= 3: badges.append(('🔥', f'{streak}-Day Streak'))
-    except Exception as e:
-        print(f"Error getting user stats: {e}")
+    except Exception:
+        log.exception("Error getting user stats")
         user_stats = {'total_quizzes': 0, 'average_score': 0, 'total_words': 0, 'total_correct': 0}
 
     return render_template('profile.html', user=user, stats=user_stats,
@@ -976,7 +2116,7 @@ def profile_edit():
             flash('Name cannot be empty.', 'error')
             return render_template('profile_edit.html', user=user)
 
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             conn.execute('UPDATE users SET name = ? WHERE id = ?', (name, user['id']))
             conn.commit()
         session['user_name'] = name
@@ -992,7 +2132,7 @@ def profile_edit():
             elif not authenticate_user(user['email'], current_pw):
                 flash('Current password is incorrect.', 'error')
             else:
-                with sqlite3.connect(DATABASE) as conn:
+                with connect_db() as conn:
                     conn.execute('UPDATE users SET password_hash = ? WHERE id = ?',
                                  (hash_password(new_pw), user['id']))
                     conn.commit()
@@ -1007,14 +2147,17 @@ def profile_edit():
 @app.route('/practice_missed')
 @login_required
 def practice_missed():
-    """Start a quiz built from the user's historically misspelled words."""
-    misses = get_user_misses(session['user_id'])
-    words = [w for w, _ in misses]
-    if not words:
-        flash('No missed words yet — take a quiz first!', 'info')
+    """Start a quiz from the missed words that are due for spaced-repetition review."""
+    selected_words = get_due_reviews(session['user_id'])
+    if not selected_words:
+        upcoming = next_review_at(session['user_id'])
+        if upcoming is None:
+            flash('No missed words yet — take a quiz first!', 'info')
+        else:
+            when = datetime.fromtimestamp(upcoming).strftime('%B %d')
+            flash(f'Nice work — no missed words are due for review until {when}.', 'info')
         return redirect(url_for('setup'))
 
-    selected_words = words[:20]
     config = {
         'grades': ['missed'],
         'word_type': 'r',
@@ -1052,7 +2195,7 @@ def privacy():
 SEO_GRADES = [('k', 'kindergarten-spelling-words', 'Kindergarten')] + [
     (g, f'grade-{g}-spelling-words', f'Grade {g}') for g in range(1, 13)
 ]
-_SEO_BY_SLUG = {slug: (grade, name) for grade, slug, name in SEO_GRADES}
+_SEO_BY_SLUG = {slug: (idx, grade, name) for idx, (grade, slug, name) in enumerate(SEO_GRADES)}
 
 def words_for_grade(grade):
     """All words for a grade, split into (sight_words, regular_words), sorted."""
@@ -1062,51 +2205,161 @@ def words_for_grade(grade):
             (sight if d['sight_word'] else regular).append((w, d['definition']))
     return sorted(sight), sorted(regular)
 
-@app.route('/words')
-def words_index():
-    """Index of all grade-level word lists (public, SEO)."""
+# The word lists only change when word_lists.py does, so split them by grade
+# once at import and fingerprint each page's content for HTTP validators.
+_SEO_WORDS = {grade: words_for_grade(grade) for grade, _, _ in SEO_GRADES}
+
+def _content_hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+PAGE_HASHES = {slug: _content_hash(_SEO_WORDS[grade]) for grade, slug, _ in SEO_GRADES}
+PAGE_HASHES[''] = _content_hash([len(word_dictionary)] + [PAGE_HASHES[slug] for _, slug, _ in SEO_GRADES])
+
+# page key -> (hash, last changed); filled by load_page_versions()
+_page_versions = {}
+
+def load_page_versions():
+    """Record each word-list page's content hash, advancing its changed_at only
+    when the hash differs from the stored one, and cache {key: (hash, datetime)}."""
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    with connect_db() as conn:
+        conn.executemany('''
+            INSERT INTO page_versions (page, hash, changed_at) VALUES (?, ?, ?)
+            ON CONFLICT(page) DO UPDATE SET hash = excluded.hash, changed_at = excluded.changed_at
+            WHERE page_versions.hash != excluded.hash
+        ''', [(key, h, now) for key, h in PAGE_HASHES.items()])
+        rows = conn.execute('SELECT page, hash, changed_at FROM page_versions').fetchall()
+    versions = {page: (h, datetime.fromisoformat(changed_at))
+                for page, h, changed_at in rows if page in PAGE_HASHES}
+    _page_versions.clear()
+    _page_versions.update(versions)
+    return versions
+
+def page_version(key):
+    if key not in _page_versions:
+        load_page_versions()
+    return _page_versions[key]
+
+def render_words_index(**context):
     grades = []
     for grade, slug, name in SEO_GRADES:
-        sight, regular = words_for_grade(grade)
+        sight, regular = _SEO_WORDS[grade]
         grades.append({'slug': slug, 'name': name,
                        'count': len(sight) + len(regular),
                        'sample': [w for w, _ in (sight + regular)[:6]]})
     return render_template('words_index.html', grades=grades,
-                           total=len(word_dictionary))
+                           total=len(word_dictionary), **context)
 
-@app.route('/words/<slug>')
-def words_grade(slug):
-    """One grade's spelling word list with definitions (public, SEO)."""
-    if slug not in _SEO_BY_SLUG:
-        return redirect(url_for('words_index'))
-    grade, name = _SEO_BY_SLUG[slug]
-    sight, regular = words_for_grade(grade)
-    idx = next(i for i, (g, s, n) in enumerate(SEO_GRADES) if s == slug)
+def render_words_grade(slug, **context):
+    idx, grade, name = _SEO_BY_SLUG[slug]
+    sight, regular = _SEO_WORDS[grade]
     prev_g = SEO_GRADES[idx - 1] if idx > 0 else None
     next_g = SEO_GRADES[idx + 1] if idx < len(SEO_GRADES) - 1 else None
     return render_template('words_grade.html', slug=slug, grade_name=name,
                            sight_words=sight, regular_words=regular,
                            count=len(sight) + len(regular),
-                           prev_g=prev_g, next_g=next_g)
+                           prev_g=prev_g, next_g=next_g, **context)
+
+# Anonymous (crawler) views of the word-list pages are rendered once per worker
+# and kept pre-compressed: page key ('' = index, else slug) -> {encoding: bytes}.
+_word_page_cache = {}
+
+def _build_word_page(key):
+    # No CSRF token in shared pages: nothing on them POSTs, and a token would
+    # be bound to whichever session happened to render the page. The fresh app
+    # context gives the render its own g, so when this is built lazily inside a
+    # live request, popping it doesn't run the teardown hooks on the outer one.
+    with app.app_context(), app.test_request_context('/', base_url='https://spellaroo.com'):
+        no_token = {'csrf_token': lambda: ''}
+        html = render_words_grade(key, **no_token) if key else render_words_index(**no_token)
+    if app.config['MINIFY_HTML']:
+        html = minify_html(html)
+    html = html.encode('utf-8')
+    page = {'identity': html, 'gzip': gzip.compress(html, compresslevel=9)}
+    if brotli is not None:
+        page['br'] = brotli.compress(html, quality=11)
+    return page
+
+def prerender_word_pages():
+    """Render and compress every public word-list page (call at worker start)."""
+    for key in [''] + [slug for _, slug, _ in SEO_GRADES]:
+        _word_page_cache[key] = _build_word_page(key)
+    return len(_word_page_cache)
+
+def serve_word_page(key, render):
+    """Serve a cached word-list page with validators and the best pre-compressed body.
+    Logged-in users get a live render (their navbar differs)."""
+    if 'user_id' in session:
+        return render()
+    page = _word_page_cache.get(key)
+    if page is None:
+        page = _word_page_cache[key] = _build_word_page(key)
+    encoding = next((e for e in ('br', 'gzip') if e in page and e in request.accept_encodings), 'identity')
+    resp = app.response_class(page[encoding], mimetype='text/html')
+    if encoding != 'identity':
+        resp.headers['Content-Encoding'] = encoding
+    resp.vary.add('Accept-Encoding')
+    page_hash, changed_at = page_version(key)
+    resp.set_etag(f'words-{key or "index"}-{page_hash}', weak=True)
+    resp.last_modified = changed_at
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 3600
+    return resp.make_conditional(request)
 
-@app.route('/sitemap.xml')
-def sitemap():
-    """XML sitemap for search engines."""
-    base = 'https://spellaroo.com'
-    urls = [f'{base}/', f'{base}/words', f'{base}/privacy'] + \
-           [f'{base}/words/{slug}' for _, slug, _ in SEO_GRADES]
+@app.route('/words')
+def words_index():
+    """Index of all grade-level word lists (public, SEO)."""
+    return serve_word_page('', render_words_index)
+
+@app.route('/words/<slug>')
+def words_grade(slug):
+    """One grade's spelling word list with definitions (public, SEO)."""
+    if slug not in _SEO_BY_SLUG:
+        return redirect(url_for('words_index'))
+    return serve_word_page(slug, lambda: render_words_grade(slug))
+
+SITE_URL = 'https://spellaroo.com'
+ROBOTS_TXT = f'User-agent: *\nAllow: /\nSitemap: {SITE_URL}/sitemap.xml\n'
+
+# Built once per dictionary version: {'xml': bytes, 'etag': str, 'lastmod': datetime}
+_sitemap = {}
+
+def build_sitemap():
+    """Render the sitemap with per-page <lastmod> from the page_versions table."""
+    versions = load_page_versions()
+    entries = [(f'{SITE_URL}/', None), (f'{SITE_URL}/words', versions[''][1]),
+               (f'{SITE_URL}/privacy', None)] + \
+              [(f'{SITE_URL}/words/{slug}', versions[slug][1]) for _, slug, _ in SEO_GRADES]
     xml = ['<?xml version="1.0" encoding="UTF-8"?>',
            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
-    for u in urls:
-        xml.append(f'  <url><loc>{u}</loc></url>')
+    for loc, lastmod in entries:
+        if lastmod:
+            xml.append(f'  <url><loc>{loc}</loc><lastmod>{lastmod.isoformat()}</lastmod></url>')
+        else:
+            xml.append(f'  <url><loc>{loc}</loc></url>')
     xml.append('</urlset>')
-    return app.response_class('\n'.join(xml), mimetype='application/xml')
+    _sitemap.update(xml='\n'.join(xml).encode('utf-8'),
+                    etag=f'sitemap-{versions[""][0]}',
+                    lastmod=max(changed_at for _, changed_at in versions.values()))
+    return _sitemap
+
+@app.route('/sitemap.xml')
+def sitemap():
+    """XML sitemap for search engines."""
+    sm = _sitemap or build_sitemap()
+    resp = app.response_class(sm['xml'], mimetype='application/xml')
+    resp.set_etag(sm['etag'], weak=True)
+    resp.last_modified = sm['lastmod']
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 3600
+    return resp.make_conditional(request)
 
 @app.route('/robots.txt')
 def robots():
-    return app.response_class(
-        'User-agent: *\nAllow: /\nSitemap: https://spellaroo.com/sitemap.xml\n',
-        mimetype='text/plain')
+    resp = app.response_class(ROBOTS_TXT, mimetype='text/plain')
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 86400
+    return resp
 
 @app.route('/setup', methods=['GET', 'POST'])
 @login_required
@@ -1130,13 +2383,14 @@ def setup():
                         pass
             
             word_type = request.form.get('word_type', 'r')
+            difficulty = request.form.get('difficulty', 'any')
             num_words = int(request.form.get('num_words', 10))
             
             if not grades:
                 return jsonify({'error': 'Please select valid grade levels (k for kindergarten, 1-12 for grades)'}), 400
             
             # Build word pool
-            available_words = build_word_pool(grades, word_type)
+            available_words = build_word_pool(grades, word_type, difficulty)
             
             if len(available_words) < num_words:
                 return jsonify({'error': f'Only {len(available_words)} words available for selected criteria'}), 400
@@ -1162,7 +2416,8 @@ def setup():
 
             # Remember these choices for next time
             save_user_prefs(session['user_id'], {
-                'grades': grades, 'word_type': word_type, 'num_words': num_words
+                'grades': grades, 'word_type': word_type, 'num_words': num_words,
+                'difficulty': difficulty
             })
 
             return redirect(url_for('quiz'))
@@ -1216,7 +2471,8 @@ def submit_answer():
     # Check answer
     is_correct = user_answer == current_word.lower()
 
-    # Track per-word accuracy (feeds the home-page word cloud)
+    # Track per-word accuracy (feeds the home-page word cloud) and reschedule
+    # the word in the user's spaced-repetition queue
     record_word_attempt(session['user_id'], current_word, is_correct)
 
     # Character-by-character diff (lowercase = right, UPPERCASE = wrong/missing)
@@ -1301,38 +2557,8 @@ def results():
 def statistics():
     """Statistics page"""
     try:
-        with sqlite3.connect(DATABASE) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            # Get the logged-in user's recent sessions
-            recent_sessions = conn.execute('''
-                SELECT * FROM sessions
-                WHERE user_id = ?
-                ORDER BY created_at DESC
-                LIMIT 20
-            ''', (session['user_id'],)).fetchall()
-
-            # Get the logged-in user's overall statistics
-            overall_stats = conn.execute('''
-                SELECT
-                    COUNT(*) as total_sessions,
-                    AVG(percentage) as avg_percentage,
-                    SUM(total_words) as total_words_attempted,
-                    SUM(correct_count) as total_correct
-                FROM sessions
-                WHERE user_id = ?
-            ''', (session['user_id'],)).fetchone()
-            
-        # Top misspelled words for this user (with definitions)
-        top_missed = [
-            {'word': w, 'count': c, 'definition': word_dictionary[w]['definition']}
-            for w, c in get_user_misses(session['user_id'], limit=10)
-        ]
-
-        return render_template('statistics.html',
-                             recent_sessions=recent_sessions,
-                             overall_stats=overall_stats,
-                             top_missed=top_missed)
+        stats = get_user_stats(session['user_id'])
+        return render_template('statistics.html', **stats)
     except Exception as e:
         return render_template('statistics.html',
                              recent_sessions=[],
@@ -1340,6 +2566,21 @@ def statistics():
                              top_missed=[],
                              error=str(e))
 
+@app.route('/api/stats')
+@login_required
+def api_stats():
+    """The statistics page's data as JSON, with an ETag for conditional GETs."""
+    user_id = session['user_id']
+    last_id = last_session_id(user_id)
+    etag = stats_etag(user_id, last_id)
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = jsonify(get_user_stats(user_id, last_id))
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    return resp
+
 @app.route('/quiz/quit', methods=['POST'])
 @login_required
 def quit_quiz():
@@ -1349,6 +2590,70 @@ def quit_quiz():
     flash('Quiz ended.', 'info')
     return redirect(url_for('setup'))
 
+# ---- Health checks ---------------------------------------------------------------------
+# Unauthenticated probes for mod_wsgi/load balancer/monitoring. /healthz only
+# says the process is serving. /readyz checks what a request needs and reports
+# each check's time: the database answers a trivial query on a read-only
+# connection (so a probe never takes a write lock, and waits at most
+# READY_DB_TIMEOUT behind one), its schema version matches this code, the word
+# dictionary is loaded, and the static asset manifest parses if a build exists.
+# Returns 503 when any check fails. Neither touches the session.
+
+READY_DB_TIMEOUT = float(os.environ.get('READY_DB_TIMEOUT', '1'))
+
+def _timed_check(fn):
+    start = time.perf_counter()
+    try:
+        result = dict(fn(), ok=True)
+    except Exception as e:
+        result = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+    result['ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+def _check_database():
+    uri = 'file:' + quote(os.path.abspath(DATABASE)) + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, timeout=READY_DB_TIMEOUT)
+    try:
+        conn.execute('SELECT 1 FROM users LIMIT 1').fetchall()
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(f'schema version {version}, expected {SCHEMA_VERSION}')
+    return {'schema_version': version}
+
+def _check_dictionary():
+    if not word_dictionary:
+        raise RuntimeError('word dictionary is empty')
+    return {'words': len(word_dictionary)}
+
+def _check_static_manifest():
+    if not os.path.exists(STATIC_MANIFEST_FILE):
+        return {'enabled': False}
+    with open(STATIC_MANIFEST_FILE) as f:
+        return {'enabled': True, 'files': len(json.load(f))}
+
+def health_response(payload, ok=True):
+    resp = jsonify(payload)
+    resp.status_code = 200 if ok else 503
+    resp.cache_control.no_store = True
+    return resp
+
+@app.route('/healthz')
+def healthz():
+    return health_response({'status': 'ok', 'pid': os.getpid(),
+                            'uptime_s': round(time.time() - METRICS_STARTED_AT, 1)})
+
+@app.route('/readyz')
+def readyz():
+    start = time.perf_counter()
+    checks = {'database': _timed_check(_check_database),
+              'dictionary': _timed_check(_check_dictionary),
+              'static_manifest': _timed_check(_check_static_manifest)}
+    ok = all(check['ok'] for check in checks.values())
+    return health_response({'status': 'ok' if ok else 'unavailable', 'checks': checks,
+                            'ms': round((time.perf_counter() - start) * 1000, 2)}, ok)
+
 # ---- Admin / user management ---------------------------------------------------------
 
 @app.route('/admin')
@@ -1356,6 +2661,21 @@ def quit_quiz():
 def admin():
     return redirect(url_for('admin_users'))
 
+@app.route('/admin/metrics')
+def admin_metrics():
+    """Prometheus metrics for this worker: admins, or a scraper sending
+    `Authorization: Bearer $METRICS_TOKEN`."""
+    auth = request.headers.get('Authorization', '')
+    if METRICS_TOKEN and hmac.compare_digest(auth, f'Bearer {METRICS_TOKEN}'):
+        return metrics_response()
+    return admin_required(metrics_response)()
+
+def metrics_response():
+    resp = app.response_class(render_metrics(), mimetype='text/plain')
+    resp.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    resp.cache_control.no_store = True
+    return resp
+
 @app.route('/admin/users')
 @admin_required
 def admin_users():
@@ -1373,7 +2693,7 @@ def admin_users():
         where = 'WHERE u.name LIKE ? OR u.email LIKE ?'
         params = [f'%{q}%', f'%{q}%']
 
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         conn.row_factory = sqlite3.Row
         total = conn.execute(f'SELECT COUNT(*) AS c FROM users u {where}', params).fetchone()['c']
         rows = conn.execute(f'''
@@ -1400,7 +2720,7 @@ def admin_user_detail(user_id):
         flash('User not found.', 'error')
         return redirect(url_for('admin_users'))
 
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         conn.row_factory = sqlite3.Row
         flags = conn.execute('SELECT is_admin, is_active FROM users WHERE id = ?', (user_id,)).fetchone()
         stats = conn.execute('''
@@ -1423,7 +2743,7 @@ def admin_toggle_active(user_id):
     if user_id == session['user_id']:
         flash("You can't deactivate your own account.", 'error')
         return redirect(url_for('admin_user_detail', user_id=user_id))
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         row = conn.execute('SELECT email, is_active FROM users WHERE id = ?', (user_id,)).fetchone()
         if not row:
             flash('User not found.', 'error')
@@ -1431,6 +2751,7 @@ def admin_toggle_active(user_id):
         new_state = 0 if (row[1] if row[1] is not None else 1) else 1
         conn.execute('UPDATE users SET is_active = ? WHERE id = ?', (new_state, user_id))
         conn.commit()
+    invalidate_role(user_id)
     log_admin_action('activate' if new_state else 'deactivate', user_id, row[0])
     flash(f"Account {'reactivated' if new_state else 'deactivated'}.", 'success')
     return redirect(url_for('admin_user_detail', user_id=user_id))
@@ -1439,7 +2760,7 @@ def admin_toggle_active(user_id):
 @admin_required
 def admin_toggle_admin(user_id):
     """Promote or demote admin, guarding against removing the last admin."""
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         row = conn.execute('SELECT email, is_admin FROM users WHERE id = ?', (user_id,)).fetchone()
         if not row:
             flash('User not found.', 'error')
@@ -1451,6 +2772,7 @@ def admin_toggle_admin(user_id):
         new_state = 0 if currently_admin else 1
         conn.execute('UPDATE users SET is_admin = ? WHERE id = ?', (new_state, user_id))
         conn.commit()
+    invalidate_role(user_id)
     log_admin_action('grant_admin' if new_state else 'revoke_admin', user_id, row[0])
     flash(f"Admin {'granted' if new_state else 'revoked'}.", 'success')
     return redirect(url_for('admin_user_detail', user_id=user_id))
@@ -1459,7 +2781,7 @@ def admin_toggle_admin(user_id):
 @admin_required
 def admin_reset_password(user_id):
     """Set a temporary password for a local account and show it once."""
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         row = conn.execute('SELECT email, auth_provider FROM users WHERE id = ?', (user_id,)).fetchone()
         if not row:
             flash('User not found.', 'error')
@@ -1481,7 +2803,7 @@ def admin_delete_user(user_id):
     if user_id == session['user_id']:
         flash("You can't delete your own account.", 'error')
         return redirect(url_for('admin_user_detail', user_id=user_id))
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         row = conn.execute('SELECT email, is_admin FROM users WHERE id = ?', (user_id,)).fetchone()
         if not row:
             flash('User not found.', 'error')
@@ -1489,14 +2811,105 @@ def admin_delete_user(user_id):
         if row[1] and count_admins() <= 1:
             flash('Cannot delete the last remaining admin.', 'error')
             return redirect(url_for('admin_user_detail', user_id=user_id))
-        for tbl in ('sessions', 'quiz_state', 'user_prefs'):
+        for tbl in ('sessions', 'quiz_state', 'user_prefs', 'word_review'):
             conn.execute(f'DELETE FROM {tbl} WHERE user_id = ?', (user_id,))
         conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
         conn.commit()
+    invalidate_role(user_id)
     log_admin_action('delete_user', user_id, row[0])
     flash(f'Deleted {row[0]} and all associated data.', 'success')
     return redirect(url_for('admin_users'))
 
+# ---- Data-access exports ---------------------------------------------------------------
+# Exports are streamed so memory stays flat no matter how many sessions a user
+# (or the whole district) has accumulated. Rows are read in keyset pages of
+# EXPORT_PAGE_ROWS and each page is fetched in full before anything is yielded:
+# the main DB is not in WAL mode, so a cursor left open while the client reads
+# would hold a SHARED lock and block every writer for the whole download.
+
+EXPORT_USER_COLUMNS = 'id, name, email, birth_year, birth_month, google_id, auth_provider'
+EXPORT_PAGE_ROWS = int(os.environ.get('EXPORT_PAGE_ROWS', 500))
+EXPORT_BATCH_USERS = int(os.environ.get('EXPORT_BATCH_USERS', 100))
+
+def _export_prefs(conn, user_id):
+    row = conn.execute('SELECT prefs FROM user_prefs WHERE user_id = ?', (user_id,)).fetchone()
+    return json.loads(row[0]) if row and row[0] else None
+
+def _export_sessions(conn, user_id):
+    """Yield pages of the user's quiz sessions, oldest first."""
+    last_id = 0
+    while True:
+        rows = conn.execute('SELECT * FROM sessions WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?',
+                            (user_id, last_id, EXPORT_PAGE_ROWS)).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1]['id']
+        yield rows
+
+def _export_word_stats(conn, user_id):
+    """Yield pages of the user's per-word tallies, alphabetically."""
+    last_word = ''
+    while True:
+        rows = conn.execute('''SELECT word, correct, incorrect FROM word_stats
+                               WHERE user_id = ? AND word > ? ORDER BY word LIMIT ?''',
+                            (user_id, last_word, EXPORT_PAGE_ROWS)).fetchall()
+        if not rows:
+            return
+        last_word = rows[-1]['word']
+        yield rows
+
+def iter_user_export_json(user):
+    """Yield one user's export as chunks of a single JSON document."""
+    conn = connect_db()
+    conn.row_factory = sqlite3.Row
+    try:
+        yield '{"user": %s, "preferences": %s' % (json.dumps(user), json.dumps(_export_prefs(conn, user['id'])))
+        for key, pages in (('word_stats', _export_word_stats(conn, user['id'])),
+                           ('quiz_sessions', _export_sessions(conn, user['id']))):
+            yield f', "{key}": ['
+            sep = ''
+            for rows in pages:
+                yield sep + ', '.join(json.dumps(dict(row)) for row in rows)
+                sep = ', '
+            yield ']'
+        yield '}\n'
+    finally:
+        conn.close()
+
+def iter_users_export_ndjson(user_ids=None):
+    """Yield NDJSON records (one object per line) for the given users, or everyone.
+
+    Each line is tagged with a "type" of user, preferences, word_stat or
+    quiz_session. Users are read in keyset batches of EXPORT_BATCH_USERS and
+    their rows a page at a time, so memory is bounded by one page.
+    """
+    conn = connect_db()
+    conn.row_factory = sqlite3.Row
+    try:
+        where, params = '', []
+        if user_ids:
+            where = f"AND id IN ({','.join('?' * len(user_ids))})"
+            params = list(user_ids)
+        last_id = 0
+        while True:
+            users = conn.execute(f'SELECT {EXPORT_USER_COLUMNS} FROM users WHERE id > ? {where} '
+                                 'ORDER BY id LIMIT ?', [last_id, *params, EXPORT_BATCH_USERS]).fetchall()
+            if not users:
+                break
+            last_id = users[-1]['id']
+            for user in users:
+                uid = user['id']
+                yield (json.dumps({'type': 'user', **dict(user)}) + '\n' +
+                       json.dumps({'type': 'preferences', 'user_id': uid,
+                                   'preferences': _export_prefs(conn, uid)}) + '\n')
+                for rows in _export_word_stats(conn, uid):
+                    yield ''.join(json.dumps({'type': 'word_stat', 'user_id': uid, **dict(row)}) + '\n'
+                                  for row in rows)
+                for rows in _export_sessions(conn, uid):
+                    yield ''.join(json.dumps({'type': 'quiz_session', **dict(row)}) + '\n' for row in rows)
+    finally:
+        conn.close()
+
 @app.route('/admin/users/<int:user_id>/export')
 @admin_required
 def admin_export_user(user_id):
@@ -1505,31 +2918,38 @@ def admin_export_user(user_id):
     if not user:
         flash('User not found.', 'error')
         return redirect(url_for('admin_users'))
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = sqlite3.Row
-        sessions_rows = [dict(r) for r in conn.execute(
-            'SELECT * FROM sessions WHERE user_id = ? ORDER BY created_at', (user_id,)).fetchall()]
-        prefs = conn.execute('SELECT prefs FROM user_prefs WHERE user_id = ?', (user_id,)).fetchone()
-    export = {'user': user, 'preferences': json.loads(prefs[0]) if prefs and prefs[0] else None,
-              'quiz_sessions': sessions_rows}
-    resp = jsonify(export)
+    resp = app.response_class(iter_user_export_json(user), mimetype='application/json')
     resp.headers['Content-Disposition'] = f'attachment; filename=spellaroo_user_{user_id}.json'
     log_admin_action('export_user', user_id, user['email'])
     return resp
 
+@app.route('/admin/export.ndjson')
+@admin_required
+def admin_bulk_export():
+    """Stream NDJSON for the selected users (?user_ids=1&user_ids=2), or everyone."""
+    ids = [int(x) for x in request.args.getlist('user_ids') if x.isdigit()]
+    resp = app.response_class(iter_users_export_ndjson(ids or None), mimetype='application/x-ndjson')
+    stamp = datetime.now().strftime('%Y%m%d')
+    resp.headers['Content-Disposition'] = f'attachment; filename=spellaroo_export_{stamp}.ndjson'
+    log_admin_action('bulk_export', detail=f'{len(ids)} users: {ids}' if ids else 'all users')
+    return resp
+
 @app.route('/admin/users/bulk', methods=['POST'])
 @admin_required
 def admin_bulk():
-    """Bulk deactivate/reactivate selected users."""
+    """Bulk deactivate/reactivate (or export) selected users."""
     action = request.form.get('bulk_action')
     ids = [int(x) for x in request.form.getlist('user_ids') if x.isdigit()]
+    if action == 'export' and ids:
+        return redirect(url_for('admin_bulk_export', user_ids=ids))
     ids = [i for i in ids if i != session['user_id']]  # never touch self
     if action in ('deactivate', 'reactivate') and ids:
         new_state = 1 if action == 'reactivate' else 0
-        with sqlite3.connect(DATABASE) as conn:
+        with connect_db() as conn:
             conn.executemany('UPDATE users SET is_active = ? WHERE id = ?',
                              [(new_state, i) for i in ids])
             conn.commit()
+        invalidate_role(*ids)
         log_admin_action(f'bulk_{action}', detail=f'{len(ids)} users: {ids}')
         flash(f'{action.title()}d {len(ids)} user(s).', 'success')
     else:
@@ -1540,11 +2960,34 @@ def admin_bulk():
 @admin_required
 def admin_audit():
     """Recent admin actions."""
-    with sqlite3.connect(DATABASE) as conn:
+    with connect_db() as conn:
         conn.row_factory = sqlite3.Row
         rows = conn.execute('SELECT * FROM audit_log ORDER BY created_at DESC LIMIT 100').fetchall()
     return render_template('admin_audit.html', rows=rows)
 
+@app.route('/admin/diagnostics')
+@admin_required
+def admin_diagnostics():
+    """Query profiler totals for this worker: hot statements, queries per request, slow log."""
+    queries, endpoints, slow = query_profile_snapshot()
+    return render_template('admin_diagnostics.html', queries=queries, endpoints=endpoints, slow=slow,
+                           enabled=QUERY_PROFILE, slow_ms=SLOW_QUERY_MS, profiles=list_profiles())
+
+@app.route('/admin/diagnostics/profiles/<name>')
+@admin_required
+def admin_download_profile(name):
+    """Download a saved request profile."""
+    if not _PROFILE_NAME.match(name):
+        abort(404)
+    return send_from_directory(PROFILE_DIR, name, as_attachment=True)
+
+@app.route('/admin/diagnostics/reset', methods=['POST'])
+@admin_required
+def admin_diagnostics_reset():
+    reset_query_profile()
+    flash('Query profile reset.', 'success')
+    return redirect(url_for('admin_diagnostics'))
+
 @app.route('/api/word_data/<word>')
 def get_word_data(word):
     """API endpoint to get word data"""
@@ -1572,7 +3015,8 @@ def get_available_words():
                     pass
         
         word_type = request.args.get('word_type', 'r')
-        available_words = build_word_pool(grades, word_type)
+        difficulty = request.args.get('difficulty', 'any')
+        available_words = build_word_pool(grades, word_type, difficulty)
 
         return jsonify({
             'count': len(available_words),
@@ -1587,6 +3031,7 @@ if __name__ == '__main__':
     app.config['SESSION_COOKIE_SECURE'] = False
     os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
     init_db()
+    load_word_difficulty()
     print("Initializing Spellaroo...")
     print(f"Word dictionary loaded: {len(word_dictionary)} words")
     app.run(debug=True, host='0.0.0.0', port=5557)
\ No newline at end of file
@@ -9,6 +9,9 @@ import base64
 import warnings
 import logging
 import sys
+import atexit
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 
@@ -58,6 +61,52 @@ pygame.mixer.init()
 _auth_token = None
 _use_google_tts = True  # Set to False to use espeak instead
 
+# ---- TTS instrumentation ----
+# Every say() records what happened (component parsing, cache lookups, Google
+# synthesis, disk writes, playback, espeak fallbacks) as JSON lines in one
+# trace file per run under TTS_TRACE_DIR. Set TTS_TRACE=0 to disable.
+# Summarize with: python3 utils/tts_trace_report.py
+
+TTS_TRACE_DIR = "tts_traces"
+_tts_trace_enabled = os.environ.get('TTS_TRACE', '1') != '0'
+_tts_trace_file = None
+_tts_counters = Counter()
+_say_playback_spans = None  # (start, end) of each file played by the current say()
+
+def _tts_event(event, **fields):
+    """Append one event to this run's trace file"""
+    global _tts_trace_file
+    if not _tts_trace_enabled:
+        return
+    try:
+        if _tts_trace_file is None:
+            os.makedirs(TTS_TRACE_DIR, exist_ok=True)
+            path = os.path.join(TTS_TRACE_DIR, f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}.jsonl")
+            _tts_trace_file = open(path, 'a', buffering=1)
+            _tts_trace_file.write(json.dumps({"t": time.time(), "event": "session_start",
+                                              "google_tts": _use_google_tts}) + "\n")
+        _tts_trace_file.write(json.dumps({"t": time.time(), "event": event, **fields}) + "\n")
+    except OSError:
+        pass
+
+def _tts_count(name, amount=1):
+    _tts_counters[name] += amount
+
+@contextmanager
+def _tts_timer(event, **fields):
+    """Time a block and record it as an event; the block may add fields via the yielded dict"""
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        _tts_event(event, ms=round((time.perf_counter() - start) * 1000, 2), **fields)
+
+@atexit.register
+def _close_tts_trace():
+    if _tts_trace_file is not None:
+        _tts_event("counters", **_tts_counters)
+        _tts_trace_file.close()
+
 def _get_oauth_token():
     """Get OAuth token using the credentials from voiceAPI.json"""
     global _auth_token
@@ -149,11 +198,38 @@ def _should_cache_component(component):
     # Don't cache very long phrases - they're less likely to be reused
     return True
 
+def _cache_lookup(filepath):
+    """Check the voice_files cache for a component, recording hit/miss"""
+    with _tts_timer("cache_lookup", file=os.path.basename(filepath)) as ev:
+        ev["hit"] = os.path.exists(filepath)
+    _tts_count("cache_hits" if ev["hit"] else "cache_misses")
+    return ev["hit"]
+
+def _timed_google_tts(component):
+    """_try_google_cloud_tts with latency and outcome recorded"""
+    _tts_count("google_calls")
+    with _tts_timer("synthesis", chars=len(component)) as ev:
+        audio = _try_google_cloud_tts(component)
+        ev["ok"] = bool(audio)
+        ev["bytes"] = len(audio) if audio else 0
+    if not audio:
+        _tts_count("google_failures")
+    return audio
+
+def _write_audio(filepath, audio):
+    with _tts_timer("disk_write", file=os.path.basename(filepath), bytes=len(audio)):
+        with open(filepath, 'wb') as f:
+            f.write(audio)
+    _tts_count("disk_writes")
+
 def _synthesize_speech_google(text):
     """Use Google Cloud TTS API with component-based caching for maximum efficiency"""
     try:
         # Parse text into cacheable components
-        components = _parse_speech_components(text)
+        with _tts_timer("parse", chars=len(text)) as ev:
+            components = _parse_speech_components(text)
+            ev["components"] = len(components)
+        _tts_count("components", len(components))
         
         if len(components) == 1:
             # Single component - handle normally
@@ -169,18 +245,17 @@ def _synthesize_speech_google(text):
                 os.makedirs('voice_files', exist_ok=True)
                 
                 # Check if cached file exists
-                if os.path.exists(filepath):
+                if _cache_lookup(filepath):
                     return filepath
                 
                 # Generate and cache new file
-                google_audio = _try_google_cloud_tts(component)
+                google_audio = _timed_google_tts(component)
                 if google_audio:
-                    with open(filepath, 'wb') as f:
-                        f.write(google_audio)
+                    _write_audio(filepath, google_audio)
                     return filepath
             else:
                 # Generate temporary file
-                google_audio = _try_google_cloud_tts(component)
+                google_audio = _timed_google_tts(component)
                 if google_audio:
                     import tempfile
                     with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
@@ -200,20 +275,19 @@ def _synthesize_speech_google(text):
                     # Ensure voice_files directory exists
                     os.makedirs('voice_files', exist_ok=True)
                     
-                    if os.path.exists(filepath):
+                    if _cache_lookup(filepath):
                         component_files.append(filepath)
                     else:
                         # Generate and cache component
-                        google_audio = _try_google_cloud_tts(component)
+                        google_audio = _timed_google_tts(component)
                         if google_audio:
-                            with open(filepath, 'wb') as f:
-                                f.write(google_audio)
+                            _write_audio(filepath, google_audio)
                             component_files.append(filepath)
                         else:
                             return None  # Failed to generate component
                 else:
                     # Generate temporary file for non-cacheable component
-                    google_audio = _try_google_cloud_tts(component)
+                    google_audio = _timed_google_tts(component)
                     if google_audio:
                         import tempfile
                         with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
@@ -230,6 +304,7 @@ def _synthesize_speech_google(text):
         
     except Exception as e:
         print(f"Speech synthesis failed: {e}")
+        _tts_event("synthesis_error", error=f"{type(e).__name__}: {e}")
         return None
     """Use Google Cloud TTS API to synthesize speech and save to file, or use espeak without caching"""
     try:
@@ -294,6 +369,7 @@ def _try_google_cloud_tts(text):
             if isinstance(creds, dict) and creds.get('type') == 'service_account':
                 service_account_path = 'voiceAPI.json'
             else:
+                _tts_event("google_unavailable", reason="no service account credentials")
                 return None  # OAuth2 credentials, not service account
         
         # Try to use Google Cloud TTS
@@ -343,29 +419,38 @@ def _try_google_cloud_tts(text):
                 
         except ImportError:
             # Google Cloud TTS library not available - silent fallback
+            _tts_event("google_unavailable", reason="google-cloud-texttospeech not installed")
             return None
         except Exception as e:
             # Google Cloud TTS API call failed - silent fallback  
+            _tts_event("google_unavailable", reason=f"API error: {type(e).__name__}: {e}")
             return None
             
     except Exception as e:
         # Error setting up Google Cloud TTS - silent fallback
+        _tts_event("google_unavailable", reason=f"setup error: {type(e).__name__}: {e}")
         return None
 
 def _play_audio_file(filepath):
     """Play audio file using pygame"""
-    try:
-        pygame.mixer.music.load(filepath)
-        pygame.mixer.music.play()
-        
-        # Wait for playback to complete
-        while pygame.mixer.music.get_busy():
-            pygame.time.wait(100)
-        
-        return 0  # Success
-    except Exception as e:
-        print(f"Failed to play audio file {filepath}: {e}")
-        return 1  # Error
+    with _tts_timer("playback", file=os.path.basename(filepath)) as ev:
+        try:
+            pygame.mixer.music.load(filepath)
+            pygame.mixer.music.play()
+            started = time.perf_counter()
+            
+            # Wait for playback to complete
+            while pygame.mixer.music.get_busy():
+                pygame.time.wait(100)
+            
+            if _say_playback_spans is not None:
+                _say_playback_spans.append((started, time.perf_counter()))
+            return 0  # Success
+        except Exception as e:
+            print(f"Failed to play audio file {filepath}: {e}")
+            ev["error"] = f"{type(e).__name__}: {e}"
+            _tts_count("playback_errors")
+            return 1  # Error
 
 def play_sound_effect(filename):
     """Play a sound effect file"""
@@ -458,12 +543,28 @@ def compare_spellings(correct_word, user_input):
 
 def say(text: str, pitch: int=70) -> int:
     """Convert text to speech using component-based Google TTS caching, or espeak without caching."""
+    global _say_playback_spans
+    _tts_count("say_calls")
+    _say_playback_spans = []
+    start = time.perf_counter()
+    with _tts_timer("say", chars=len(text)) as ev:
+        result = _say(text, pitch, ev)
+        spans, _say_playback_spans = _say_playback_spans, None
+        if spans:
+            # Dead time before the first sound and between component files
+            ev["first_audio_ms"] = round((spans[0][0] - start) * 1000, 2)
+            ev["gaps_ms"] = [round((b[0] - a[1]) * 1000, 2) for a, b in zip(spans, spans[1:])]
+        ev["result"] = result
+    return result
+
+def _say(text, pitch, ev):
     global _use_google_tts
     
     if _use_google_tts:
         # Try to use component-based Google TTS with smart caching
         audio_result = _synthesize_speech_google(text)
         if audio_result:
+            ev["path"] = "google"
             if isinstance(audio_result, list):
                 # Multiple component files - play them sequentially
                 for audio_file in audio_result:
@@ -499,11 +600,13 @@ def say(text: str, pitch: int=70) -> int:
         else:
             # Google TTS not available - use espeak directly without caching
             print(f"Google TTS failed for: '{text}' - falling back to espeak")
-            pass
+            _tts_count("espeak_fallbacks")
+            ev["fallback"] = True
     else:
         print("Google TTS disabled - using espeak")
     
     # Use espeak directly (no file caching)
+    ev["path"] = "espeak"
     return subprocess.run(['espeak', f'-p {pitch}', text]).returncode
 
 # Function to spell out a word with commas
@@ -645,8 +748,146 @@ def build_word_pool(grades, word_type):
     
     return []
 
+# Session history is an append-only JSONL log: one record per line, appended
+# with a single O_APPEND write, so saving a quiz costs O(1) no matter how long
+# the history is and a crash can at worst leave one torn trailing line.
+SESSIONS_FILE = "sessions.jsonl"
+LEGACY_SESSIONS_FILE = "sessions.json"
+
+def _legacy_line(record):
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+def import_legacy_sessions(legacy_file=LEGACY_SESSIONS_FILE, log_file=SESSIONS_FILE):
+    """One-time import of an old sessions.json array into the JSONL log.
+
+    Imported records are placed ahead of anything already in the log, the new
+    log is swapped in atomically, and the old file is renamed to
+    sessions.json.imported. If a crash lands between those two renames, the
+    next run finds the records already at the head of the log and only
+    finishes the rename, so nothing is imported twice. A file that doesn't
+    parse is set aside as sessions.json.corrupt. Returns the number of
+    records imported.
+    """
+    if not os.path.exists(legacy_file):
+        return 0
+    try:
+        with open(legacy_file, 'r') as f:
+            legacy = json.load(f)
+    except ValueError as e:
+        os.replace(legacy_file, legacy_file + '.corrupt')
+        print(f"Could not read {legacy_file} ({e}); moved it to {legacy_file}.corrupt")
+        return 0
+    lines = [_legacy_line(record) for record in legacy]
+
+    # Already imported by a run that stopped before renaming the old file
+    if lines and os.path.exists(log_file):
+        with open(log_file, 'r') as existing:
+            head = [existing.readline() for _ in lines]
+        if head == lines:
+            os.replace(legacy_file, legacy_file + '.imported')
+            return 0
+
+    tmp_file = log_file + '.tmp'
+    with open(tmp_file, 'w') as out:
+        out.writelines(lines)
+        if os.path.exists(log_file):
+            with open(log_file, 'r') as existing:
+                for line in existing:
+                    out.write(line if line.endswith('\n') else line + '\n')
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_file, log_file)
+    os.replace(legacy_file, legacy_file + '.imported')
+    return len(legacy)
+
+def append_session(record, log_file=SESSIONS_FILE):
+    """Atomically append one session record to the JSONL log."""
+    line = (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+    fd = os.open(log_file, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        # Start on a fresh line if a crash left a torn record at the end
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b'\n':
+            line = b'\n' + line
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def load_sessions(log_file=SESSIONS_FILE):
+    """Yield session records from the JSONL log, skipping a torn trailing line."""
+    if not os.path.exists(log_file):
+        return
+    with open(log_file, 'r') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+# Running totals for the stats screen, kept in sync with the log on every save
+# so show_play_statistics never has to re-read the history. The week window is
+# held as per-day buckets; log_bytes records the log size the aggregate covers,
+# and any mismatch (e.g. the log was edited by hand) triggers a one-off rebuild.
+STATS_FILE = "session_stats.json"
+STATS_WINDOW_DAYS = 7
+
+def _empty_session_stats():
+    return {"log_bytes": 0, "total_sessions": 0, "total_correct": 0, "total_words": 0,
+            "days": {}, "misses": {}}
+
+def _add_session_to_stats(stats, record):
+    """Fold one session record into the aggregate."""
+    stats["total_sessions"] += 1
+    stats["total_correct"] += record["correct_count"]
+    stats["total_words"] += record["total_words"]
+    day = stats["days"].setdefault(record["date_time"][:10], [0, 0, 0])
+    day[0] += 1
+    day[1] += record["correct_count"]
+    day[2] += record["total_words"]
+    misses = stats["misses"]
+    for word in record["incorrect_words"]:
+        misses[word] = misses.get(word, 0) + 1
+
+def _prune_session_stats(stats):
+    """Drop day buckets that have fallen out of the rolling window (today and the 6 days before)."""
+    cutoff = (datetime.now().date() - timedelta(days=STATS_WINDOW_DAYS - 1)).isoformat()
+    stats["days"] = {d: b for d, b in stats["days"].items() if d >= cutoff}
+
+def _log_size(log_file=SESSIONS_FILE):
+    return os.path.getsize(log_file) if os.path.exists(log_file) else 0
+
+def save_session_stats(stats, stats_file=STATS_FILE):
+    """Write the aggregate atomically (temp file + rename)."""
+    tmp_file = stats_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(stats, f, separators=(',', ':'))
+    os.replace(tmp_file, stats_file)
+
+def rebuild_session_stats(log_file=SESSIONS_FILE):
+    """Recompute the aggregate from the full log (only needed when it is out of sync)."""
+    stats = _empty_session_stats()
+    for record in load_sessions(log_file):
+        _add_session_to_stats(stats, record)
+    stats["log_bytes"] = _log_size(log_file)
+    _prune_session_stats(stats)
+    return stats
+
+def load_session_stats(stats_file=STATS_FILE, log_file=SESSIONS_FILE):
+    """Load the aggregate, rebuilding it if it doesn't cover exactly the current log."""
+    try:
+        with open(stats_file, 'r') as f:
+            stats = json.load(f)
+        if stats.get("log_bytes") == _log_size(log_file):
+            return stats
+    except (OSError, ValueError):
+        pass
+    stats = rebuild_session_stats(log_file)
+    save_session_stats(stats, stats_file)
+    return stats
+
 def save_session_data(grades, word_type, correct_count, incorrect_count, incorrect_words):
-    """Save quiz session data to sessions.json"""
+    """Append quiz session data to the sessions.jsonl log"""
     try:
         # Create session record
         session_data = {
@@ -659,76 +900,45 @@ def save_session_data(grades, word_type, correct_count, incorrect_count, incorre
             "total_words": correct_count + incorrect_count
         }
         
-        # Load existing sessions or create new list
-        sessions_file = "sessions.json"
-        if os.path.exists(sessions_file):
-            with open(sessions_file, 'r') as f:
-                sessions = json.load(f)
-        else:
-            sessions = []
+        stats = load_session_stats()
+        append_session(session_data)
+        _add_session_to_stats(stats, session_data)
+        _prune_session_stats(stats)
+        stats["log_bytes"] = _log_size()
+        save_session_stats(stats)
         
-        # Add new session
-        sessions.append(session_data)
-        
-        # Save updated sessions
-        with open(sessions_file, 'w') as f:
-            json.dump(sessions, f, indent=2)
-        
-        print(f"Session saved to {sessions_file}")
+        print(f"Session saved to {SESSIONS_FILE}")
         
     except Exception as e:
         print(f"Failed to save session data: {e}")
 
 def show_play_statistics():
-    """Display comprehensive play statistics from sessions.json"""
+    """Display comprehensive play statistics from the persisted aggregate"""
     try:
-        sessions_file = "sessions.json"
-        if not os.path.exists(sessions_file):
-            print("No session data available yet.")
-            return
-        
-        with open(sessions_file, 'r') as f:
-            sessions = json.load(f)
+        stats = load_session_stats()
         
-        if not sessions:
+        if not stats["total_sessions"]:
             print("No session data available yet.")
             return
         
-        # Calculate date one week ago
-        one_week_ago = datetime.now() - timedelta(days=7)
-        
-        # Initialize counters
-        total_sessions = len(sessions)
-        sessions_last_week = 0
-        total_correct = 0
-        total_words = 0
-        correct_last_week = 0
-        words_last_week = 0
-        all_incorrect_words = []
-        
-        # Process each session
-        for session in sessions:
-            session_date = datetime.fromisoformat(session["date_time"])
-            
-            # Add to totals
-            total_correct += session["correct_count"]
-            total_words += session["total_words"]
-            all_incorrect_words.extend(session["incorrect_words"])
-            
-            # Check if session is within last week
-            if session_date >= one_week_ago:
-                sessions_last_week += 1
-                correct_last_week += session["correct_count"]
-                words_last_week += session["total_words"]
+        # Totals come straight from the aggregate
+        total_sessions = stats["total_sessions"]
+        total_correct = stats["total_correct"]
+        total_words = stats["total_words"]
+        
+        # Sum the day buckets that fall within the last week
+        _prune_session_stats(stats)
+        sessions_last_week = sum(b[0] for b in stats["days"].values())
+        correct_last_week = sum(b[1] for b in stats["days"].values())
+        words_last_week = sum(b[2] for b in stats["days"].values())
         
         # Calculate percentages
         overall_percentage = (total_correct / total_words * 100) if total_words > 0 else 0
         week_percentage = (correct_last_week / words_last_week * 100) if words_last_week > 0 else 0
         
-        # Count misspelled words and get top 10
+        # Get top 10 misspelled words
         from collections import Counter
-        misspelled_counter = Counter(all_incorrect_words)
-        top_misspelled = misspelled_counter.most_common(10)
+        top_misspelled = Counter(stats["misses"]).most_common(10)
         
         # Display statistics
         print("\n" + "="*50)
@@ -871,6 +1081,14 @@ def main_game_loop():
     """Main game loop that handles play again functionality"""
     printandsay("Welcome to the Spelling Quiz Game!", refresh=False)
     
+    # Bring over history from the old whole-file format before anything is saved
+    try:
+        imported = import_legacy_sessions()
+        if imported:
+            print(f"Imported {imported} sessions from {LEGACY_SESSIONS_FILE}")
+    except OSError as e:
+        print(f"Failed to import {LEGACY_SESSIONS_FILE}: {e}")
+    
     # First game - always ask for setup
     grades = get_grade_levels()
     word_type = get_word_type()
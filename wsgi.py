@@ -10,11 +10,23 @@ import sys
 # Add your project directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from web_quiz import app, init_db
+from web_quiz import app, init_db, load_word_difficulty, prerender_word_pages, build_sitemap, warm_templates
 
 # Initialize database on startup
 init_db()
 
+# Load precomputed word difficulty scores (see utils/compute_difficulty.py)
+load_word_difficulty()
+
+# Compile (or load cached bytecode for) every template before the first request
+warm_templates()
+
+# Render the public word-list pages once, pre-compressed, before serving traffic
+prerender_word_pages()
+
+# Record word-list page versions and build the sitemap from them
+build_sitemap()
+
 # WSGI application object
 application = app
 